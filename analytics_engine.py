@@ -0,0 +1,302 @@
+import numpy as np
+
+from player_identity import normalize_name
+from rank_gaps import METRIC_SOURCES, PairComparison, RankGap, check_metrics
+
+# Columns pulled into memory for each stats table
+BATTING_COLUMNS = [
+    "player_id", "format_id", "rank", "matches", "innings", "runs", "average",
+    "strike_rate", "highest_score", "fours", "sixes", "fifties", "hundreds"
+]
+BOWLING_COLUMNS = [
+    "player_id", "format_id", "rank", "matches", "innings", "wickets", "average",
+    "economy", "strike_rate", "bowling_figure", "runs"
+]
+FLOAT_COLUMNS = {"average", "strike_rate", "economy", "bowling_figure"}
+
+# Highest code point, used as the upper bound of a prefix range on the sorted name index
+_PREFIX_END = "\U0010ffff"
+
+
+def _to_python(value):
+    """Convert NumPy scalars to plain Python values so results compare equal to SQL rows"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _column_arrays(rows, columns):
+    """Turn fetched row tuples into one NumPy array per column"""
+    arrays = {}
+    for i, column in enumerate(columns):
+        values = [row[i] for row in rows]
+        if column in FLOAT_COLUMNS:
+            arrays[column] = np.array([float(v) if v is not None else np.nan for v in values], dtype=np.float64)
+        else:
+            arrays[column] = np.array([v if v is not None else 0 for v in values], dtype=np.int64)
+    return arrays
+
+
+class StatsEngine:
+    """In-memory columnar copy of players and stats that answers the query.py questions locally"""
+
+    def __init__(self):
+        self.batting = {}
+        self.bowling = {}
+        self.player_names = {}
+        self.format_names = {}
+        self.alias_keys = []
+        self.batting_by_format = {}
+        self.bowling_by_format = {}
+        self._sorted_names = np.array([], dtype=object)
+        self._all_rounder_names = []
+        self._ids_by_name_key = {}
+        self._row_index = {}
+        self._metric_sorted = {}
+        self._batting_order = {}
+        self._bowling_order = {}
+
+    @classmethod
+    def from_cursor(cls, cursor):
+        """Build an engine from an open database cursor"""
+        engine = cls()
+        engine.load(cursor)
+        return engine
+
+    def load(self, cursor):
+        """Load players, formats and both stats tables once and build the indexes"""
+        cursor.execute("SELECT player_id, full_name FROM players ORDER BY player_id")
+        self.player_names = dict(cursor.fetchall())
+
+        cursor.execute("SELECT format_id, format_name FROM formats ORDER BY format_id")
+        self.format_names = dict(cursor.fetchall())
+
+        cursor.execute("SELECT alias_key, player_id FROM player_aliases WHERE alias_key IS NOT NULL ORDER BY alias_name")
+        self.alias_keys = cursor.fetchall()
+
+        cursor.execute(f"SELECT {', '.join(BATTING_COLUMNS)} FROM batting_stats ORDER BY batting_id")
+        self.batting = _column_arrays(cursor.fetchall(), BATTING_COLUMNS)
+
+        cursor.execute(f"SELECT {', '.join(BOWLING_COLUMNS)} FROM bowling_stats ORDER BY bowling_id")
+        self.bowling = _column_arrays(cursor.fetchall(), BOWLING_COLUMNS)
+
+        self._build_indexes()
+        return self
+
+    def _build_indexes(self):
+        """Attach names, then build the name index, format index and sort orders"""
+        for table in (self.batting, self.bowling):
+            table["full_name"] = np.array(
+                [self.player_names.get(pid, "") for pid in table["player_id"]], dtype=object
+            )
+            table["format_name"] = np.array(
+                [self.format_names.get(fid, "") for fid in table["format_id"]], dtype=object
+            )
+            table["name_text"] = table["full_name"].astype(str)
+
+        self._sorted_names = np.array(sorted(set(self.player_names.values())), dtype=object)
+
+        both = np.intersect1d(self.batting["player_id"], self.bowling["player_id"])
+        self._all_rounder_names = sorted(
+            {self.player_names[pid] for pid in both.tolist() if self.player_names.get(pid)}
+        )
+
+        self.batting_by_format = self._format_index(self.batting)
+        self.bowling_by_format = self._format_index(self.bowling)
+
+        # Canonical name keys plus recorded aliases, like player_identity.PLAYER_KEYS_CTE
+        self._ids_by_name_key = {}
+        name_keys = [(normalize_name(name), player_id) for player_id, name in self.player_names.items()]
+        for name_key, player_id in name_keys + self.alias_keys:
+            ids = self._ids_by_name_key.setdefault(name_key, [])
+            if player_id in self.player_names and player_id not in ids:
+                ids.append(player_id)
+
+        # (player_id, format_id) -> row position, and per-format metric values sorted high to low
+        self._row_index = {
+            'batting_stats': self._player_format_index(self.batting),
+            'bowling_stats': self._player_format_index(self.bowling),
+        }
+        self._metric_sorted = {}
+        for metric, (table_name, column) in METRIC_SOURCES.items():
+            table = self.batting if table_name == 'batting_stats' else self.bowling
+            by_format = self.batting_by_format if table_name == 'batting_stats' else self.bowling_by_format
+            for format_id, format_name in self.format_names.items():
+                positions = by_format[format_name]
+                self._metric_sorted[(metric, format_id)] = np.sort(table[column][positions])[::-1]
+
+        # Stable descending orders so top-K is a slice and ties keep load order (batting_id /
+        # bowling_id), the same tie-breaker as the SQL in query.py
+        self._batting_order = {
+            column: np.argsort(-self.batting[column], kind="stable")
+            for column in ("runs", "matches")
+        }
+        self._bowling_order = {
+            column: np.argsort(-self.bowling[column], kind="stable")
+            for column in ("matches", "wickets")
+        }
+        strike_rate = np.nan_to_num(self.batting["strike_rate"], nan=-np.inf)
+        self._batting_order["strike_rate"] = np.argsort(-strike_rate, kind="stable")
+
+    def _format_index(self, table):
+        """Map format name to the row positions of that format"""
+        return {
+            format_name: np.flatnonzero(table["format_id"] == format_id)
+            for format_id, format_name in self.format_names.items()
+        }
+
+    def _player_format_index(self, table):
+        """Map (player_id, format_id) to the row position in a stats table"""
+        return {
+            (player_id, format_id): position
+            for position, (player_id, format_id) in enumerate(
+                zip(table["player_id"].tolist(), table["format_id"].tolist())
+            )
+        }
+
+    def to_frames(self):
+        """Return players, batting and bowling as pandas DataFrames for notebooks"""
+        import pandas as pd
+
+        players = pd.DataFrame(
+            {"player_id": list(self.player_names), "full_name": list(self.player_names.values())}
+        )
+        return players, pd.DataFrame(self.batting), pd.DataFrame(self.bowling)
+
+    def _rows(self, table, positions, columns):
+        """Build result tuples for the given row positions"""
+        return [tuple(_to_python(table[column][i]) for column in columns) for i in positions]
+
+    def _name_matches(self, table, *terms):
+        """Boolean mask of rows whose player name contains any of the terms (case-sensitive like LIKE)"""
+        names = table["name_text"]
+        mask = np.zeros(len(names), dtype=bool)
+        for term in terms:
+            mask |= np.char.find(names, term) >= 0
+        return mask
+
+    # 🔎 Search
+
+    def search_players_by_prefix(self, prefix):
+        """Names of players starting with the given prefix"""
+        start = np.searchsorted(self._sorted_names, prefix, side="left")
+        end = np.searchsorted(self._sorted_names, prefix + _PREFIX_END, side="right")
+        return [(name,) for name in self._sorted_names[start:end]]
+
+    def search_player_batting(self, first_name, last_name):
+        """Batting runs and matches per format for a player matched by first or last name"""
+        positions = np.flatnonzero(self._name_matches(self.batting, first_name, last_name))
+        rows = set(self._rows(self.batting, positions, ("full_name", "format_name", "runs", "matches")))
+        return sorted(rows, key=lambda row: (row[1], row[0]))
+
+    # 📊 Match records
+
+    def player_with_most_matches(self):
+        """Batting record with the highest number of matches"""
+        order = self._batting_order["matches"]
+        return self._rows(self.batting, order[:1], ("full_name", "matches"))[0] if len(order) else None
+
+    def player_with_fewest_matches(self):
+        """Batting record with the lowest number of matches (at least 1)"""
+        order = self._batting_order["matches"]
+        positions = order[self.batting["matches"][order] > 0]
+        if not len(positions):
+            return None
+        fewest = self.batting["matches"][positions[-1]]
+        first = positions[self.batting["matches"][positions] == fewest][0]
+        return self._rows(self.batting, [first], ("full_name", "matches"))[0]
+
+    # 🏏 Performance
+
+    def top_batsmen_by_runs(self, limit=5):
+        """Top batting records by runs across formats"""
+        order = self._batting_order["runs"][:limit]
+        return self._rows(self.batting, order, ("full_name", "runs", "matches", "format_name"))
+
+    def top_bowlers_by_matches(self, limit=5):
+        """Top bowling records by matches across formats"""
+        order = self._bowling_order["matches"]
+        order = order[self.bowling["matches"][order] > 0][:limit]
+        return self._rows(self.bowling, order, ("full_name", "matches", "format_name"))
+
+    def most_aggressive_batsman(self, min_matches=10):
+        """Batting record with the highest strike rate, or None if strike rates are missing"""
+        order = self._batting_order["strike_rate"]
+        strike_rate = self.batting["strike_rate"][order]
+        keep = (self.batting["matches"][order] >= min_matches) & (strike_rate > 0)
+        order = order[keep]
+        if not len(order):
+            return None
+        return self._rows(
+            self.batting, order[:1], ("full_name", "strike_rate", "runs", "matches", "format_name")
+        )[0]
+
+    def top_scorer_fallback(self):
+        """Batting record with the most runs (used when strike rates are missing)"""
+        order = self._batting_order["runs"]
+        order = order[self.batting["runs"][order] > 0]
+        if not len(order):
+            return None
+        return self._rows(self.batting, order[:1], ("full_name", "runs", "matches", "format_name"))[0]
+
+    def all_rounders(self, limit=15):
+        """Players with both batting and bowling records"""
+        return [(name,) for name in self._all_rounder_names[:limit]]
+
+    # ⚔️ Comparisons
+
+    def _player_ids(self, name):
+        """Player ids whose normalized name key or a recorded alias matches the given name"""
+        return self._ids_by_name_key.get(normalize_name(name), [])
+
+    def rank_gaps(self, players, metrics=('matches',), target_ranks=(5,), formats=None):
+        """Current rank and gap to each target rank, matching rank_gaps.fetch_rank_gaps"""
+        check_metrics(metrics)
+        results = []
+        player_ids = dict.fromkeys(pid for name in players for pid in self._player_ids(name))
+        for player_id in player_ids:
+            for metric in metrics:
+                table_name, column = METRIC_SOURCES[metric]
+                rows = self._row_index[table_name]
+                table = self.batting if table_name == 'batting_stats' else self.bowling
+                for format_id, format_name in self.format_names.items():
+                    if formats and format_name not in formats:
+                        continue
+                    position = rows.get((player_id, format_id))
+                    if position is None:
+                        continue
+                    ordered = self._metric_sorted[(metric, format_id)]
+                    value = _to_python(table[column][position])
+                    current_rank = int(np.searchsorted(-ordered, -value, side="left")) + 1
+                    for target_rank in target_ranks:
+                        target_value = _to_python(ordered[target_rank - 1]) if 0 < target_rank <= len(ordered) else None
+                        gap = target_value - value if target_value is not None else None
+                        results.append(RankGap(
+                            self.player_names[player_id], format_name, metric, value,
+                            current_rank, target_rank, target_value, gap
+                        ))
+        return sorted(results, key=lambda row: (row.full_name, row.format_name, row.metric, row.target_rank))
+
+    def pair_comparisons(self, pairs, metrics=('matches',), formats=None):
+        """A vs B comparisons, matching rank_gaps.fetch_pair_comparisons"""
+        check_metrics(metrics)
+        results = []
+        for name_a, name_b in pairs:
+            for id_a in self._player_ids(name_a):
+                for id_b in self._player_ids(name_b):
+                    for metric in metrics:
+                        table_name, column = METRIC_SOURCES[metric]
+                        rows = self._row_index[table_name]
+                        table = self.batting if table_name == 'batting_stats' else self.bowling
+                        for format_id, format_name in self.format_names.items():
+                            if formats and format_name not in formats:
+                                continue
+                            pos_a = rows.get((id_a, format_id))
+                            pos_b = rows.get((id_b, format_id))
+                            if pos_a is None or pos_b is None:
+                                continue
+                            value_a = _to_python(table[column][pos_a])
+                            value_b = _to_python(table[column][pos_b])
+                            results.append(PairComparison(
+                                self.player_names[id_a], self.player_names[id_b], format_name,
+                                metric, value_a, value_b, value_b - value_a
+                            ))
+        return sorted(results, key=lambda row: (row.player_a, row.player_b, row.format_name, row.metric))
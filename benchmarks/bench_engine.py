@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+import statistics
+from decimal import Decimal
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+import query
+from analytics_engine import StatsEngine
+from rank_gaps import fetch_pair_comparisons, fetch_rank_gaps
+
+# Load environment variables
+load_dotenv()
+
+PAIRS = [("Rohit Sharma", "Virat Kohli")]
+SQUAD = ["Harbhajan Singh", "Rohit Sharma", "Virat Kohli"]
+RANK_METRICS = ["matches", "runs", "wickets"]
+TARGET_RANKS = [1, 5, 10]
+
+# (label, SQL-path call, engine call) for every query.py question
+QUESTIONS = [
+    ("1. prefix search", lambda cur: query.search_players_by_prefix(cur, 'V'),
+     lambda eng: eng.search_players_by_prefix('V')),
+    ("2. player search", lambda cur: query.search_player_batting(cur, 'Virat', 'Kohli'),
+     lambda eng: eng.search_player_batting('Virat', 'Kohli')),
+    ("3. most matches", query.player_with_most_matches,
+     lambda eng: eng.player_with_most_matches()),
+    ("4. fewest matches", query.player_with_fewest_matches,
+     lambda eng: eng.player_with_fewest_matches()),
+    ("5. top batsmen", lambda cur: query.top_batsmen_by_runs(cur, 5),
+     lambda eng: eng.top_batsmen_by_runs(5)),
+    ("6. top bowlers", lambda cur: query.top_bowlers_by_matches(cur, 5),
+     lambda eng: eng.top_bowlers_by_matches(5)),
+    ("7. aggressive batsman", lambda cur: query.most_aggressive_batsman(cur, 10),
+     lambda eng: eng.most_aggressive_batsman(10)),
+    ("8. all-rounders", lambda cur: query.all_rounders(cur, 15),
+     lambda eng: eng.all_rounders(15)),
+    ("9. rohit vs virat", lambda cur: fetch_pair_comparisons(cur, PAIRS, ["matches"], ["ODI"]),
+     lambda eng: eng.pair_comparisons(PAIRS, ["matches"], ["ODI"])),
+    ("10. rank gaps", lambda cur: fetch_rank_gaps(cur, SQUAD, RANK_METRICS, TARGET_RANKS),
+     lambda eng: eng.rank_gaps(SQUAD, RANK_METRICS, TARGET_RANKS)),
+]
+
+
+def normalize(result):
+    """Make SQL and engine results comparable (Decimal vs float, list vs tuple)"""
+    if result is None:
+        return None
+    if isinstance(result, (list, tuple)):
+        return tuple(normalize(value) for value in result)
+    if isinstance(result, Decimal):
+        return float(result)
+    return result
+
+
+def time_call(func, arg, repeat):
+    """Median wall time of func(arg) in milliseconds, plus the last result"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main(repeat=20):
+    conn = db.connect()
+    cur = conn.cursor()
+
+    start = time.perf_counter()
+    engine = StatsEngine.from_cursor(cur)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"📥 Engine loaded in {load_ms:.1f} ms "
+          f"({len(engine.batting['player_id'])} batting, {len(engine.bowling['player_id'])} bowling rows)")
+
+    print(f"\n{'Question':<24}{'SQL (ms)':>12}{'Engine (ms)':>14}{'Speed-up':>10}  Match")
+    print("-" * 68)
+    mismatches = 0
+    for label, sql_call, engine_call in QUESTIONS:
+        sql_ms, sql_result = time_call(sql_call, cur, repeat)
+        engine_ms, engine_result = time_call(engine_call, engine, repeat)
+        same = normalize(sql_result) == normalize(engine_result)
+        mismatches += 0 if same else 1
+        speedup = sql_ms / engine_ms if engine_ms else float('inf')
+        print(f"{label:<24}{sql_ms:>12.3f}{engine_ms:>14.4f}{speedup:>9.0f}x  {'✅' if same else '❌'}")
+        if not same:
+            print(f"    SQL:    {sql_result}")
+            print(f"    Engine: {engine_result}")
+
+    print("-" * 68)
+    print("🎉 All results identical" if not mismatches else f"⚠️  {mismatches} result(s) differ")
+
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
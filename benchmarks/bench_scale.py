@@ -0,0 +1,290 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from itertools import islice
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+
+import db
+import query
+from analytics_engine import StatsEngine
+from create_table import create_schema
+from insert import DataInserter
+from rank_gaps import fetch_rank_gaps
+from ranking_engine import RankingEngine
+from synthetic import (
+    FORMATS, player_name, raw_batting_rows, raw_bowling_rows, render_batting_page,
+    typed_batting_rows, typed_bowling_rows,
+)
+from test_odi_batting import batting_buffer, clean_batting_rows, parse_batting_page
+from test_odi_bowling import bowling_buffer, clean_bowling_rows
+
+RESULTS_DIR = os.path.join(ROOT, "results")
+FIXTURES_DIR = os.path.join(ROOT, "fixtures")
+
+# A dedicated scratch database: every scale drops and recreates all tables in it
+BENCH_DATABASE_URL = os.getenv('BENCH_DATABASE_URL', 'postgresql://localhost/bcci_bench')
+BENCH_SQLITE_PATH = os.path.join(ROOT, "bench.db")
+
+# A stage counts as a regression when it is this much slower than the previous run
+REGRESSION_THRESHOLD = 1.2
+
+
+def _timed(func, *args):
+    """Wall time of func(*args) in ms, with the scripts' progress output suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def _median_ms(func, repeat):
+    return statistics.median(_timed(func)[0] for _ in range(repeat))
+
+
+def _peak_kib(func):
+    """Peak traced allocation (KiB) while func runs, including what it returns"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def warm_up_parsing(rows=50):
+    """One untimed pass through every parse/clean stage
+
+    The parsers import bs4, lxml and pandas lazily; without this the first timed
+    call (the fixtures, then the smallest scale) pays for those imports.
+    """
+    page = render_batting_page(raw_batting_rows(rows))
+    with contextlib.redirect_stdout(io.StringIO()):
+        clean_batting_rows(parse_batting_page(page))
+        clean_bowling_rows(list(raw_bowling_rows(rows)))
+        parse_batting_page(page, batting_buffer())
+
+
+def bench_parsing(rows, max_rows):
+    """Parse + clean stages on synthetic pages and raw rows"""
+    rows = min(rows, max_rows)
+    page = render_batting_page(raw_batting_rows(rows))
+    parse_ms, parsed = _timed(parse_batting_page, page)
+    clean_batting_ms, _ = _timed(clean_batting_rows, parsed)
+    clean_bowling_ms, _ = _timed(clean_bowling_rows, list(raw_bowling_rows(rows)))
+    buffer_ms, _ = _timed(parse_batting_page, page, batting_buffer())
+    return {
+        "parse_rows": rows,
+        "parse_batting_ms": parse_ms,
+        "clean_batting_ms": clean_batting_ms,
+        "clean_bowling_ms": clean_bowling_ms,
+        "parse_batting_into_buffer_ms": buffer_ms,
+    }
+
+
+def bench_row_memory(rows, max_rows):
+    """Peak memory of holding scraped rows as string lists vs typed RowBuffers"""
+    rows = min(rows, max_rows)
+    return {
+        "rows_as_lists_kib": _peak_kib(
+            lambda: (list(raw_batting_rows(rows)), list(raw_bowling_rows(rows)))
+        ),
+        "rows_as_buffers_kib": _peak_kib(
+            lambda: (batting_buffer().extend(raw_batting_rows(rows)),
+                     bowling_buffer().extend(raw_bowling_rows(rows)))
+        ),
+    }
+
+
+def bench_fixtures():
+    """Parse the checked-in fixture pages (a fixed-size sanity baseline)"""
+    results = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            page = f.read()
+        parse_ms, parsed = _timed(parse_batting_page, page)
+        results[os.path.basename(path)] = {"rows": len(parsed or []), "parse_ms": parse_ms}
+    return results
+
+
+def reset_database(backend):
+    """Drop every table in the scratch database and recreate the schema with all formats"""
+    if backend == 'sqlite' and os.path.exists(BENCH_SQLITE_PATH):
+        os.remove(BENCH_SQLITE_PATH)
+    url = BENCH_SQLITE_PATH if backend == 'sqlite' else BENCH_DATABASE_URL
+    conn = db.connect(backend, url)
+    cursor = conn.cursor()
+    if backend == 'postgres':
+        for table in db.list_tables(cursor):
+            cursor.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_schema(cursor)
+    for format_name in FORMATS:
+        cursor.execute(
+            "INSERT INTO formats (format_name) VALUES (%s) ON CONFLICT (format_name) DO NOTHING",
+            (format_name,)
+        )
+    conn.commit()
+    return conn, url
+
+
+def bench_loading(backend, url, rows, batch_size):
+    """Bulk-load synthetic batting and bowling rows through DataInserter"""
+    inserter = DataInserter(backend, url)
+    with contextlib.redirect_stdout(io.StringIO()):
+        inserter.connect()
+
+    def load(kind, generator, load_rows):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for batch in _batched(generator, batch_size):
+                by_format = {}
+                for format_name, row in batch:
+                    by_format.setdefault(format_name, []).append(row)
+                for format_name, format_rows in by_format.items():
+                    load_rows(format_name, format_rows)
+        return (time.perf_counter() - start) * 1000
+
+    batting_ms = load('batting', typed_batting_rows(rows), inserter.load_batting_rows)
+    bowling_ms = load('bowling', typed_bowling_rows(rows), inserter.load_bowling_rows)
+    with contextlib.redirect_stdout(io.StringIO()):
+        inserter.close()
+    return {
+        "load_batting_ms": batting_ms,
+        "load_bowling_ms": bowling_ms,
+        "load_rows_per_s": 2 * rows / ((batting_ms + bowling_ms) / 1000) if batting_ms + bowling_ms else None,
+    }
+
+
+def bench_queries(conn, repeat):
+    """Median latency of every query.py question, rank gaps and the engine load"""
+    cursor = conn.cursor()
+    squad = [player_name(i) for i in range(10)]
+    queries = {
+        "prefix_search": lambda: query.search_players_by_prefix(cursor, 'V'),
+        "player_search": lambda: query.search_player_batting(cursor, 'Virat', 'Kohli'),
+        "most_matches": lambda: query.player_with_most_matches(cursor),
+        "fewest_matches": lambda: query.player_with_fewest_matches(cursor),
+        "top_batsmen": lambda: query.top_batsmen_by_runs(cursor, 5),
+        "top_bowlers": lambda: query.top_bowlers_by_matches(cursor, 5),
+        "aggressive_batsman": lambda: query.most_aggressive_batsman(cursor, 10),
+        "all_rounders": lambda: query.all_rounders(cursor, 15),
+        "rank_gaps_squad": lambda: fetch_rank_gaps(cursor, squad, ["matches", "runs", "wickets"], [1, 5, 10]),
+    }
+    results = {f"query_{name}_ms": _median_ms(func, repeat) for name, func in queries.items()}
+    results["engine_load_ms"] = _timed(StatsEngine.from_cursor, cursor)[0]
+    results["ranking_full_ms"], ranking = _timed(RankingEngine().load, cursor)
+    results["ranking_refresh_10_players_ms"] = _median_ms(lambda: ranking.refresh(cursor, range(1, 11)), repeat)
+    cursor.close()
+    return results
+
+
+def git_version():
+    """Current commit (with -dirty) so result files can be tied to a version"""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def previous_results(backend, scales):
+    """The most recent earlier run on the same backend that measured any of these scales
+
+    Runs on another backend (or with no scale in common) are not comparable, so they are
+    skipped rather than reported as regressions.
+    """
+    for path in sorted(glob.glob(os.path.join(RESULTS_DIR, "bench_*.json")), reverse=True):
+        with open(path, encoding="utf-8") as f:
+            results = json.load(f)
+        if results.get("backend") == backend and set(results.get("scales", {})) & set(scales):
+            return results
+    return None
+
+
+def report_regressions(current, previous):
+    """Print stages that got slower than REGRESSION_THRESHOLD since the previous run"""
+    if not previous:
+        print(f"\nℹ️  No previous {current['backend'] or 'parse-only'} results to compare against")
+        return 0
+    print(f"\n🔁 Compared with {previous['version']} ({previous['timestamp']})")
+    regressions = 0
+    for scale, stages in current["scales"].items():
+        before = previous["scales"].get(scale, {})
+        for stage, value in stages.items():
+            old = before.get(stage)
+            if not stage.endswith("_ms") or not old or value is None:
+                continue
+            if value > old * REGRESSION_THRESHOLD:
+                regressions += 1
+                print(f"   ⚠️  {scale} rows · {stage}: {old:.1f} → {value:.1f} ms ({value / old:.1f}x)")
+    if not regressions:
+        print("   ✅ No regressions")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scraping, loading and querying at scale")
+    parser.add_argument('--scales', nargs='+', type=int, default=[1_000, 10_000, 100_000],
+                        help="rows per stats table (1k to 10M)")
+    parser.add_argument('--backend', choices=['postgres', 'sqlite'], default='postgres')
+    parser.add_argument('--max-parse-rows', type=int, default=100_000,
+                        help="cap for the in-memory parse/clean stages")
+    parser.add_argument('--batch-size', type=int, default=1_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--skip-db', action='store_true', help="only run the parse/clean stages")
+    args = parser.parse_args()
+
+    warm_up_parsing()
+    current = {
+        "version": git_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "backend": None if args.skip_db else args.backend,
+        "fixtures": bench_fixtures(),
+        "scales": {},
+    }
+    for rows in args.scales:
+        print(f"\n📏 Scale: {rows:,} rows per table")
+        stages = bench_parsing(rows, args.max_parse_rows)
+        stages.update(bench_row_memory(rows, args.max_parse_rows))
+        if not args.skip_db:
+            conn, url = reset_database(args.backend)
+            stages.update(bench_loading(args.backend, url, rows, args.batch_size))
+            stages.update(bench_queries(conn, args.repeat))
+            conn.close()
+        for stage, value in stages.items():
+            print(f"   {stage:<32}{value:>14,.1f}" if isinstance(value, float) else f"   {stage:<32}{value:>14,}")
+        current["scales"][str(rows)] = stages
+
+    regressions = report_regressions(current, previous_results(current["backend"], current["scales"]))
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    filename = os.path.join(RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"\n💾 Saved {os.path.relpath(filename)}")
+    return regressions
+
+
+if __name__ == "__main__":
+    main()
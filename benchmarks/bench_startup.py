@@ -0,0 +1,86 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Every script a user or cron job runs directly
+ENTRY_POINTS = [
+    "create_table", "insert", "query", "pipeline", "export_stats", "player_profiles", "ranking_engine",
+    "test_odi_batting", "test_odi_bowling", "check_backend_parity", "check_http_scheduler", "check_offline",
+    "stats_service",
+]
+
+# Imported lazily; any of these showing up at import time is a start-up regression
+HEAVY_MODULES = ["pandas", "selenium", "webdriver_manager", "psycopg2"]
+
+
+def time_import(module, repeat):
+    """Median wall time (ms) of a fresh interpreter importing module, plus heavy modules it loaded"""
+    probe = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    timings = []
+    loaded = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+        loaded = result.stdout.strip()
+    return statistics.median(timings), loaded
+
+
+def time_connections(repeat):
+    """First (cold: TLS + auth) vs pooled connect time in ms for the configured database"""
+    import db
+
+    start = time.perf_counter()
+    conn = db.connect()
+    conn.close()
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn = db.connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+        cursor.close()
+        conn.close()
+        timings.append((time.perf_counter() - start) * 1000)
+    return cold_ms, statistics.median(timings)
+
+
+def main(repeat=5):
+    baseline_ms, _ = time_import("os", repeat)
+    print(f"🐍 Bare interpreter start-up: {baseline_ms:.0f} ms\n")
+    print(f"{'Entry point':<24}{'Import (ms)':>12}{'Over bare (ms)':>16}  Heavy modules loaded")
+    print("-" * 80)
+    for module in ENTRY_POINTS:
+        import_ms, loaded = time_import(module, repeat)
+        if import_ms is None:
+            print(f"{module:<24}{'failed':>12}  {loaded}")
+            continue
+        print(f"{module:<24}{import_ms:>12.0f}{import_ms - baseline_ms:>16.0f}  {loaded or '-'}")
+
+    print("\n🔌 Connection set-up")
+    print("-" * 40)
+    try:
+        cold_ms, pooled_ms = time_connections(repeat)
+        print(f"   First connect (TLS + auth): {cold_ms:.1f} ms")
+        print(f"   Pooled connect + SELECT 1:  {pooled_ms:.1f} ms")
+    except Exception as e:
+        print(f"   Skipped: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import ClientSession, web
+
+from stats_service import create_app
+
+# Dashboard-like mix: (path, weight)
+REQUEST_MIX = [
+    ("/players?prefix=V", 3),
+    ("/players/batting?first=Virat&last=Kohli", 2),
+    ("/players/Virat%20Kohli/profile", 4),
+    ("/players/Harbhajan%20Singh/profile", 2),
+    ("/leaderboards/batting/runs?k=10", 4),
+    ("/leaderboards/batting/runs_per_innings?k=5", 2),
+    ("/leaderboards/bowling/wickets?k=10", 3),
+    ("/rank-gaps?player=Harbhajan%20Singh&metric=matches&rank=5", 2),
+]
+
+
+async def _client(session, base_url, deadline, revalidate, latencies, statuses):
+    """One simulated dashboard: requests back to back until the deadline"""
+    paths = [path for path, weight in REQUEST_MIX for _ in range(weight)]
+    etags = {}
+    while time.perf_counter() < deadline:
+        path = random.choice(paths)
+        headers = {'If-None-Match': etags[path]} if revalidate and path in etags else {}
+        start = time.perf_counter()
+        async with session.get(base_url + path, headers=headers) as response:
+            await response.read()
+            if 'ETag' in response.headers:
+                etags[path] = response.headers['ETag']
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses[response.status] += 1
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def load_test(base_url, clients, seconds, revalidate):
+    latencies, statuses = [], Counter()
+    deadline = time.perf_counter() + seconds
+    async with ClientSession() as session:
+        await asyncio.gather(*(
+            _client(session, base_url, deadline, revalidate, latencies, statuses) for _ in range(clients)
+        ))
+        async with session.get(base_url + "/health") as response:
+            health = await response.json()
+
+    print(f"\n🚦 {clients} clients for {seconds}s against {base_url}"
+          f"{' (revalidating with If-None-Match)' if revalidate else ''}")
+    print("-" * 60)
+    print(f"   Requests:        {len(latencies):,} ({len(latencies) / seconds:,.0f} req/s)")
+    print(f"   Status codes:    {dict(sorted(statuses.items()))}")
+    if latencies:
+        print(f"   Latency p50/p95/p99: {statistics.median(latencies):.1f} / "
+              f"{_percentile(latencies, 0.95):.1f} / {_percentile(latencies, 0.99):.1f} ms")
+    print(f"   Queries run:     {health['queries_started']:,} "
+          f"({health['requests_coalesced']:,} requests coalesced)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load-test the stats service")
+    parser.add_argument('--url', help="running service to test (default: start one in-process "
+                                      "against the configured database, e.g. DB_BACKEND=sqlite)")
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--revalidate', action='store_true', help="send If-None-Match with known ETags")
+    args = parser.parse_args()
+
+    if args.url:
+        await load_test(args.url.rstrip('/'), args.clients, args.seconds, args.revalidate)
+        return
+
+    runner = web.AppRunner(create_app())
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        await load_test(f"http://127.0.0.1:{port}", args.clients, args.seconds, args.revalidate)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+import os
+import random
+from html import escape
+
+# Formats the benchmarks load; Test and ODI exist already, the rest simulate expansion
+FORMATS = ['Test', 'ODI', 'T20I', 'WTest', 'WODI', 'WT20I']
+
+FIRST_NAMES = [
+    "Virat", "Rohit", "Shikhar", "Ajinkya", "Cheteshwar", "Ravindra", "Jasprit", "Mohammed",
+    "Ishant", "Umesh", "Hardik", "Rishabh", "Shubman", "Shreyas", "Kuldeep", "Yuzvendra",
+    "Bhuvneshwar", "Axar", "Washington", "Shardul", "Mayank", "Prithvi", "Sanju", "Deepak",
+]
+LAST_NAMES = [
+    "Kohli", "Sharma", "Dhawan", "Rahane", "Pujara", "Jadeja", "Bumrah", "Shami", "Yadav",
+    "Pandya", "Pant", "Gill", "Iyer", "Chahal", "Kumar", "Patel", "Sundar", "Thakur",
+    "Agarwal", "Shaw", "Samson", "Chahar", "Ashwin", "Siraj",
+]
+
+BATTING_COLUMNS = [
+    "Rank", "Player", "Matches", "Innings", "Average", "Strike Rate",
+    "Highest Score", "4s", "6s", "50s", "100s", "Runs"
+]
+BOWLING_COLUMNS = [
+    "Rank", "Player", "Matches", "Innings", "Wickets", "Average",
+    "Bowling_Figure", "Economy", "Strike_Rate", "Runs"
+]
+
+
+def player_name(index):
+    """Deterministic, unique player name for an index"""
+    first = FIRST_NAMES[index % len(FIRST_NAMES)]
+    last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    generation = index // (len(FIRST_NAMES) * len(LAST_NAMES))
+    return f"{first} {last}" if generation == 0 else f"{first} {last} {generation}"
+
+
+def _players_per_format(rows, formats):
+    """Players needed so that rows are spread evenly over the formats"""
+    return max(1, -(-rows // len(formats)))
+
+
+def raw_batting_rows(count, seed=0):
+    """Batting rows as the scraper sees them (strings, thousands separators)"""
+    rng = random.Random(seed)
+    for i in range(count):
+        matches = rng.randint(1, 200)
+        innings = rng.randint(matches, matches * 2)
+        runs = rng.randint(0, innings * 60)
+        yield [
+            str(i + 1), player_name(i), str(matches), str(innings),
+            f"{runs / max(innings, 1):.2f}", f"{rng.uniform(30, 150):.2f}", str(rng.randint(0, 264)),
+            f"{rng.randint(0, runs // 8 + 1):,}", str(rng.randint(0, runs // 40 + 1)),
+            str(rng.randint(0, innings // 4)), str(rng.randint(0, innings // 10)), f"{runs:,}",
+        ]
+
+
+def raw_bowling_rows(count, seed=0):
+    """Bowling rows as the scraper sees them (strings, figures like '8/87')"""
+    rng = random.Random(seed)
+    for i in range(count):
+        matches = rng.randint(1, 200)
+        innings = rng.randint(1, matches * 2)
+        wickets = rng.randint(0, innings * 3)
+        runs = rng.randint(wickets * 15, wickets * 40 + 100)
+        yield [
+            str(i + 1), player_name(i), str(matches), str(innings), str(wickets),
+            f"{runs / max(wickets, 1):.2f}", f"{rng.randint(1, 10)}/{rng.randint(10, 120)}",
+            f"{rng.uniform(2.5, 9):.2f}", f"{rng.uniform(15, 90):.2f}", f"{runs:,}",
+        ]
+
+
+def typed_batting_rows(rows, formats=FORMATS, seed=0):
+    """(format_name, row dict) pairs in the loader's shape, `rows` in total across formats"""
+    players = _players_per_format(rows, formats)
+    produced = 0
+    for f, format_name in enumerate(formats):
+        for raw in raw_batting_rows(players, seed + f):
+            if produced == rows:
+                return
+            row = dict(zip(BATTING_COLUMNS, raw))
+            for column in BATTING_COLUMNS[2:]:
+                value = row[column].replace(',', '')
+                row[column] = float(value) if '.' in value else int(value)
+            row["Rank"] = int(row["Rank"])
+            produced += 1
+            yield format_name, row
+
+
+def typed_bowling_rows(rows, formats=FORMATS, seed=0):
+    """(format_name, row dict) pairs in the loader's shape, `rows` in total across formats"""
+    players = _players_per_format(rows, formats)
+    produced = 0
+    for f, format_name in enumerate(formats):
+        for raw in raw_bowling_rows(players, seed + f):
+            if produced == rows:
+                return
+            row = dict(zip(BOWLING_COLUMNS, raw))
+            wickets, conceded = row["Bowling_Figure"].split('/')
+            row["Bowling_Figure"] = round(int(wickets) / int(conceded), 3)
+            for column in ["Rank", "Matches", "Innings", "Wickets", "Runs"]:
+                row[column] = int(row[column].replace(',', ''))
+            for column in ["Average", "Economy", "Strike_Rate"]:
+                row[column] = float(row[column])
+            produced += 1
+            yield format_name, row
+
+
+def render_batting_page(raw_rows):
+    """HTML in the shape of a bcci.tv stats page, as parsed by test_odi_batting.parse_batting_page"""
+    raw_rows = list(raw_rows)
+    top, rest = raw_rows[0], raw_rows[1:]
+    first, _, last = top[1].partition(" ")
+    stat_cells = "".join(f"<td><p>{escape(v)}</p><span>label</span></td>" for v in top[2:])
+    body = "\n".join(
+        "<tr>" + "".join(f"<td><h6>{escape(v)}</h6></td>" for v in row) + "</tr>"
+        for row in rest
+    )
+    return f"""<html><body>
+<div class="team-ranking-wrapper player">
+  <div class="player-name-trw"><p>{escape(first)}</p><span>{escape(last)}</span></div>
+  <table><tr>{stat_cells}</tr></table>
+</div>
+<div class="stats-data-table-player">
+  <table>
+    <thead><tr><th>Rank</th><th>Player</th></tr></thead>
+    <tbody>
+{body}
+    </tbody>
+  </table>
+</div>
+</body></html>
+"""
+
+
+def write_fixtures(directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"), rows=50):
+    """(Re)write the checked-in parser fixture pages"""
+    os.makedirs(directory, exist_ok=True)
+    for name, seed in (("batting_test.html", 1), ("batting_odi.html", 2)):
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+            f.write(render_batting_page(raw_batting_rows(rows, seed)))
+
+
+if __name__ == "__main__":
+    write_fixtures()
+    print("✅ Wrote fixture pages to benchmarks/fixtures/")
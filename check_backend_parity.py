@@ -0,0 +1,93 @@
+import os
+from decimal import Decimal
+from dotenv import load_dotenv
+
+import db
+import query
+from create_table import create_schema
+from insert import DataInserter
+from rank_gaps import fetch_pair_comparisons, fetch_rank_gaps
+
+# Load environment variables
+load_dotenv()
+
+# A scratch local PostgreSQL database; it is loaded from csv_files/ just like Neon
+PARITY_DATABASE_URL = os.getenv('PARITY_DATABASE_URL', 'postgresql://localhost/bcci_parity')
+
+CHECKS = [
+    ("prefix search", lambda cur: query.search_players_by_prefix(cur, 'V')),
+    ("player search", lambda cur: query.search_player_batting(cur, 'Virat', 'Kohli')),
+    ("most matches", query.player_with_most_matches),
+    ("fewest matches", query.player_with_fewest_matches),
+    ("top batsmen", lambda cur: query.top_batsmen_by_runs(cur, 5)),
+    ("top bowlers", lambda cur: query.top_bowlers_by_matches(cur, 5)),
+    ("aggressive batsman", lambda cur: query.most_aggressive_batsman(cur, 10)),
+    ("all-rounders", lambda cur: query.all_rounders(cur, 15)),
+    ("runs per innings leaders", lambda cur: query.top_k_per_format(cur, 'runs_per_innings', 3)),
+    ("wicket leaders", lambda cur: query.top_k_per_format(cur, 'wickets', 5, 'bowling_stats')),
+    ("pair comparisons", lambda cur: fetch_pair_comparisons(cur, [("Rohit Sharma", "Virat Kohli")], ["matches"])),
+    ("rank gaps", lambda cur: fetch_rank_gaps(
+        cur, ["Harbhajan Singh", "Rohit Sharma"], ["matches", "runs", "wickets"], [1, 5])),
+]
+
+
+def normalize(result):
+    """Compare DECIMAL columns (Decimal in PostgreSQL, float in SQLite) at 2 d.p."""
+    if isinstance(result, (list, tuple)):
+        return tuple(normalize(value) for value in result)
+    if isinstance(result, (Decimal, float)):
+        return round(float(result), 2)
+    return result
+
+
+def load_backend(backend, database_url):
+    """Create the schema and load csv_files/ into one backend, returning an open connection"""
+    conn = db.connect(backend, database_url)
+    cursor = conn.cursor()
+    create_schema(cursor)
+    conn.commit()
+    cursor.close()
+
+    inserter = DataInserter(backend, database_url)
+    inserter.connect()
+    for format_name in ['test', 'odi']:
+        inserter.load_batting_data(format_name)
+        inserter.load_bowling_data(format_name)
+    inserter.close()
+    return conn
+
+
+def main():
+    print("🚀 Loading the same CSV files into PostgreSQL and SQLite...")
+    postgres = load_backend('postgres', PARITY_DATABASE_URL)
+    sqlite_path = os.getenv('PARITY_SQLITE_PATH', 'parity_check.db')
+    if os.path.exists(sqlite_path):
+        os.remove(sqlite_path)
+    sqlite = load_backend('sqlite', sqlite_path)
+
+    pg_cur, lite_cur = postgres.cursor(), sqlite.cursor()
+    print("\n" + "=" * 50)
+    print("🔍 BACKEND PARITY REPORT")
+    print("=" * 50)
+    failures = 0
+    for label, check in CHECKS:
+        expected, actual = normalize(check(pg_cur)), normalize(check(lite_cur))
+        if expected == actual:
+            print(f"   ✅ {label}")
+        else:
+            failures += 1
+            print(f"   ❌ {label}")
+            print(f"      PostgreSQL: {expected}")
+            print(f"      SQLite:     {actual}")
+
+    pg_cur.close()
+    lite_cur.close()
+    postgres.close()
+    sqlite.close()
+
+    print("\n🎉 Backends agree on every query" if not failures else f"\n⚠️  {failures} query result(s) differ")
+    return failures
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if main() else 0)
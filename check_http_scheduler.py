@@ -0,0 +1,171 @@
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import http_scheduler
+from http_scheduler import RequestScheduler
+
+# Keep the jittered backoff short; Retry-After still sets the floor for 429s
+http_scheduler.BACKOFF_BASE_SECONDS = 0.05
+http_scheduler.BACKOFF_CAP_SECONDS = 0.2
+
+SLOW_RESPONSE_SECONDS = 1.0
+HOLD_SECONDS = 0.2
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Canned responses per path; the server counts hits and requests in flight per path"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] += 1
+            hits = server.hits[self.path]
+            server.in_flight[self.path] += 1
+            server.max_in_flight[self.path] = max(server.max_in_flight[self.path], server.in_flight[self.path])
+        try:
+            if self.path == '/throttled' and hits == 1:
+                self._reply(429, {'Retry-After': '1'})
+            elif self.path == '/flaky' and hits <= 2:
+                self._reply(503)
+            elif self.path == '/missing':
+                self._reply(404)
+            elif self.path == '/slow':
+                time.sleep(SLOW_RESPONSE_SECONDS)
+                self._reply(200)
+            elif self.path == '/hold':
+                time.sleep(HOLD_SECONDS)
+                self._reply(200)
+            else:
+                self._reply(200)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up (read timeout) before the reply was written
+            pass
+        finally:
+            with server.lock:
+                server.in_flight[self.path] -= 1
+
+    def _reply(self, status, headers=None):
+        body = b"ok" if status == 200 else b"error"
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server():
+    """A ThreadingHTTPServer on a free local port, serving from a daemon thread"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits = Counter()
+    server.in_flight = Counter()
+    server.max_in_flight = Counter()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def check_retry_after(base_url, server):
+    scheduler = RequestScheduler(rate=100, burst=10)
+    start = time.monotonic()
+    response = scheduler.get(base_url + '/throttled')
+    elapsed = time.monotonic() - start
+    assert response.status_code == 200, f"status {response.status_code}"
+    assert server.hits['/throttled'] == 2, f"{server.hits['/throttled']} requests"
+    assert elapsed >= 1.0, f"retried after {elapsed:.2f}s despite Retry-After: 1"
+
+
+def check_server_error_retry(base_url, server):
+    response = RequestScheduler(rate=100, burst=10).get(base_url + '/flaky')
+    assert response.status_code == 200, f"status {response.status_code}"
+    assert server.hits['/flaky'] == 3, f"{server.hits['/flaky']} requests"
+
+
+def check_client_error_raises(base_url, server):
+    try:
+        RequestScheduler(rate=100, burst=10).get(base_url + '/missing')
+    except requests.HTTPError as e:
+        assert e.response.status_code == 404, f"status {e.response.status_code}"
+    else:
+        raise AssertionError("404 did not raise")
+    assert server.hits['/missing'] == 1, f"404 retried ({server.hits['/missing']} requests)"
+
+
+def check_read_timeout(base_url, server):
+    scheduler = RequestScheduler(rate=100, burst=10, retries=1, timeout=(1, SLOW_RESPONSE_SECONDS / 4))
+    try:
+        scheduler.get(base_url + '/slow')
+    except requests.Timeout:
+        pass
+    else:
+        raise AssertionError("slow response did not time out")
+    assert server.hits['/slow'] == 2, f"{server.hits['/slow']} requests (expected one retry)"
+
+
+def check_concurrency_cap(base_url, server):
+    scheduler = RequestScheduler(rate=100, burst=10, max_concurrent=2)
+    threads = [threading.Thread(target=scheduler.get, args=(base_url + '/hold',)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert server.hits['/hold'] == 6, f"{server.hits['/hold']} requests"
+    assert server.max_in_flight['/hold'] <= 2, f"{server.max_in_flight['/hold']} requests in flight"
+
+
+def check_rate_limit(base_url, server):
+    rate, burst, count = 5, 2, 7
+    scheduler = RequestScheduler(rate=rate, burst=burst)
+    start = time.monotonic()
+    for _ in range(count):
+        scheduler.get(base_url + '/ok')
+    elapsed = time.monotonic() - start
+    expected = (count - burst) / rate
+    assert elapsed >= expected * 0.9, f"{count} requests in {elapsed:.2f}s (limit implies >= {expected:.2f}s)"
+    assert elapsed < expected + 1.0, f"{count} requests took {elapsed:.2f}s (expected ~{expected:.2f}s)"
+
+
+CHECKS = [
+    ("429 honours Retry-After", check_retry_after),
+    ("503 is retried", check_server_error_retry),
+    ("404 raises without retrying", check_client_error_raises),
+    ("read timeout is retried, then raised", check_read_timeout),
+    ("per-host concurrency cap", check_concurrency_cap),
+    ("token-bucket rate", check_rate_limit),
+]
+
+
+def main():
+    print("🚀 Checking the request scheduler against a local stub server...")
+    server = start_stub_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print("\n" + "=" * 50)
+    print("🔍 HTTP SCHEDULER REPORT")
+    print("=" * 50)
+    failures = 0
+    for label, check in CHECKS:
+        try:
+            check(base_url, server)
+            print(f"   ✅ {label}")
+        except Exception as e:
+            failures += 1
+            print(f"   ❌ {label}: {e}")
+
+    server.shutdown()
+    server.server_close()
+
+    print("\n🎉 Scheduler behaves as expected" if not failures else f"\n⚠️  {failures} check(s) failed")
+    return failures
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if main() else 0)
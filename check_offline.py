@@ -0,0 +1,178 @@
+import contextlib
+import io
+import os
+import tempfile
+
+import db
+import pipeline
+from analytics_engine import StatsEngine
+from create_table import create_schema
+from player_identity import PlayerResolver
+from player_profiles import get_profile_by_name, rebuild_profiles
+from rank_gaps import fetch_pair_comparisons, fetch_rank_gaps
+
+
+@contextlib.contextmanager
+def scratch_database():
+    """A cursor on a fresh SQLite database with the full schema, removed afterwards"""
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    conn = db.connect('sqlite', path)
+    cursor = conn.cursor()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_schema(cursor)
+        conn.commit()
+        yield cursor
+    finally:
+        cursor.close()
+        conn.close()
+        os.remove(path)
+
+
+def _load_players(cursor, rows):
+    """Resolve (name, table, matches) rows in order, as separate loads, inserting ODI stats"""
+    cursor.execute("SELECT format_id FROM formats WHERE format_name = 'ODI'")
+    format_id = cursor.fetchone()[0]
+    for name, table, matches in rows:
+        player_id = PlayerResolver(cursor).load().resolve(name)
+        value_column = 'runs' if table == 'batting_stats' else 'wickets'
+        cursor.execute(
+            f"INSERT INTO {table} (player_id, format_id, matches, {value_column}) VALUES (%s, %s, %s, %s)",
+            (player_id, format_id, matches, matches * 10)
+        )
+    rebuild_profiles(cursor)
+
+
+def check_alias_spelling_canonical():
+    """Bowling "V Kohli" loads first, so the batting "Virat Kohli" becomes the alias"""
+    with scratch_database() as cursor:
+        _load_players(cursor, [
+            ('V Kohli', 'bowling_stats', 10),
+            ('Virat Kohli', 'batting_stats', 250),
+            ('Rohit Sharma', 'batting_stats', 230),
+        ])
+        engine = StatsEngine.from_cursor(cursor)
+
+        gaps = fetch_rank_gaps(cursor, ['Virat Kohli'], ['matches'], [1])
+        assert [(row.full_name, row.value) for row in gaps] == [('V Kohli', 250)], f"rank gaps: {gaps}"
+        assert engine.rank_gaps(['Virat Kohli'], ['matches'], [1]) == gaps, "engine rank gaps differ"
+
+        both = fetch_rank_gaps(cursor, ['Virat Kohli', 'V Kohli'], ['matches'], [1])
+        assert both == gaps, f"both spellings returned {len(both)} rows"
+        assert engine.rank_gaps(['Virat Kohli', 'V Kohli'], ['matches'], [1]) == both, "engine dedup differs"
+
+        pairs = fetch_pair_comparisons(cursor, [('Rohit Sharma', 'Virat Kohli')], ['matches'])
+        assert [(row.player_b, row.gap) for row in pairs] == [('V Kohli', 20)], f"pairs: {pairs}"
+        assert engine.pair_comparisons([('Rohit Sharma', 'Virat Kohli')], ['matches']) == pairs, "engine pairs differ"
+
+        profile = get_profile_by_name(cursor, 'Virat Kohli')
+        assert profile and profile['full_name'] == 'V Kohli', f"profile: {profile}"
+
+
+def check_alias_lookup():
+    """"Virat Kohli" is canonical and the initials spelling is only an alias"""
+    with scratch_database() as cursor:
+        _load_players(cursor, [
+            ('Virat Kohli', 'batting_stats', 250),
+            ('V Kohli', 'bowling_stats', 10),
+        ])
+        engine = StatsEngine.from_cursor(cursor)
+
+        gaps = fetch_rank_gaps(cursor, ['V Kohli'], ['matches', 'wickets'], [1])
+        assert {(row.full_name, row.metric) for row in gaps} == {
+            ('Virat Kohli', 'matches'), ('Virat Kohli', 'wickets')
+        }, f"rank gaps: {gaps}"
+        assert engine.rank_gaps(['V Kohli'], ['matches', 'wickets'], [1]) == gaps, "engine rank gaps differ"
+        assert get_profile_by_name(cursor, 'V. Kohli')['full_name'] == 'Virat Kohli', "alias profile"
+
+
+BATTING_ROW = {
+    'Player': 'Virat Kohli', 'Rank': 1, 'Matches': 250, 'Innings': 240, 'Runs': 12000, 'Average': 58.1,
+    'Strike Rate': 93.2, 'Highest Score': 183, '4s': 1100, '6s': 130, '50s': 65, '100s': 43,
+}
+BOWLING_ROW = {
+    'Player': 'Harbhajan Singh', 'Rank': 1, 'Matches': 236, 'Innings': 225, 'Wickets': 269, 'Average': 33.4,
+    'Economy': 4.3, 'Strike_Rate': 46.0, 'Bowling_Figure': 5.31, 'Runs': 8973,
+}
+
+
+def _run_stub_pipeline(cursor, bowling_rows):
+    """run_pipeline on the scratch database with one-batch stub scraper jobs; returns failed jobs"""
+    def job(kind, rows):
+        def scrape(format_name, batch_size):
+            yield pipeline.RowBatch(kind, format_name, rows)
+        return scrape
+
+    scrapers = pipeline.batting_job, pipeline.bowling_job
+    pipeline.batting_job, pipeline.bowling_job = job('batting', [BATTING_ROW]), job('bowling', bowling_rows)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return pipeline.run_pipeline(('odi',), backend='sqlite', database_url=cursor.connection.path)
+    finally:
+        pipeline.batting_job, pipeline.bowling_job = scrapers
+
+
+def check_pipeline_load_failure():
+    """A batch the loader rejects fails its job (and the exit code) instead of completing"""
+    with scratch_database() as cursor:
+        failed = _run_stub_pipeline(cursor, [{k: v for k, v in BOWLING_ROW.items() if k != 'Matches'}])
+        assert failed == 1, f"{failed} failed jobs reported for a bowling batch missing 'Matches'"
+    with scratch_database() as cursor:
+        failed = _run_stub_pipeline(cursor, [BOWLING_ROW])
+        assert failed == 0, f"{failed} failed jobs reported for valid batches"
+        cursor.execute("SELECT COUNT(*) FROM bowling_stats")
+        assert cursor.fetchone()[0] == 1, "bowling row not loaded"
+
+
+def check_trailing_comment():
+    """A script ending in a comment still returns the last statement's rows"""
+    assert db.split_statements("SELECT 1;\n-- trailing") == ["SELECT 1"], db.split_statements("SELECT 1;\n-- trailing")
+    assert len(db.split_statements("/* header */ SELECT 1; /* footer */")) == 1, "block comments"
+    with scratch_database() as cursor:
+        rows = cursor.execute("SELECT 1;\n-- trailing").fetchall()
+        assert rows == [(1,)], f"fetchall returned {rows}"
+
+
+def check_data_version_before_schema():
+    """data_version is 0 on an empty database and counts up once the schema exists"""
+    conn = db.connect('sqlite', ':memory:')
+    try:
+        assert db.data_version(conn.cursor()) == 0, "empty database"
+    finally:
+        conn.close()
+    with scratch_database() as cursor:
+        before = db.data_version(cursor)
+        db.bump_data_version(cursor)
+        assert db.data_version(cursor) == before + 1, "bump_data_version"
+
+
+CHECKS = [
+    ("alias spelling becomes canonical", check_alias_spelling_canonical),
+    ("lookups by a recorded alias", check_alias_lookup),
+    ("pipeline counts loader failures", check_pipeline_load_failure),
+    ("script with a trailing comment", check_trailing_comment),
+    ("data version before the schema exists", check_data_version_before_schema),
+]
+
+
+def main():
+    print("🚀 Running offline checks on scratch SQLite databases...")
+    print("\n" + "=" * 50)
+    print("🔍 OFFLINE CHECK REPORT")
+    print("=" * 50)
+    failures = 0
+    for label, check in CHECKS:
+        try:
+            check()
+            print(f"   ✅ {label}")
+        except Exception as e:
+            failures += 1
+            print(f"   ❌ {label}: {type(e).__name__}: {e}")
+
+    print("\n🎉 All offline checks passed" if not failures else f"\n⚠️  {failures} check(s) failed")
+    return failures
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if main() else 0)
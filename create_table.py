@@ -1,115 +1,182 @@
-import psycopg2
 import os
 from dotenv import load_dotenv
 
+import db
+from player_identity import backfill_alias_keys, merge_duplicate_players
+from player_profiles import rebuild_profiles
+
 # Load environment variables
 load_dotenv()
 
+def create_schema(cursor):
+    """Create all tables, identity keys and default formats on an open cursor"""
+    
+    # 1. Create Players table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS players (
+            player_id SERIAL PRIMARY KEY,
+            full_name VARCHAR(100) NOT NULL UNIQUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    print("✅ Created 'players' table")
+    
+    # 2. Create Formats table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS formats (
+            format_id SERIAL PRIMARY KEY,
+            format_name VARCHAR(20) NOT NULL UNIQUE
+        );
+    """)
+    print("✅ Created 'formats' table")
+    
+    # 3. Create Batting Statistics table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS batting_stats (
+            batting_id SERIAL PRIMARY KEY,
+            player_id INTEGER REFERENCES players(player_id) ON DELETE CASCADE,
+            format_id INTEGER REFERENCES formats(format_id) ON DELETE CASCADE,
+            rank INTEGER,
+            matches INTEGER,
+            innings INTEGER,
+            runs INTEGER,
+            average DECIMAL(6,2),
+            strike_rate DECIMAL(6,2),
+            highest_score INTEGER,
+            fours INTEGER,
+            sixes INTEGER,
+            fifties INTEGER,
+            hundreds INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(player_id, format_id)
+        );
+    """)
+    print("✅ Created 'batting_stats' table")
+    
+    # 4. Create Bowling Statistics table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS bowling_stats (
+            bowling_id SERIAL PRIMARY KEY,
+            player_id INTEGER REFERENCES players(player_id) ON DELETE CASCADE,
+            format_id INTEGER REFERENCES formats(format_id) ON DELETE CASCADE,
+            rank INTEGER,
+            matches INTEGER,
+            innings INTEGER,
+            wickets INTEGER,
+            average DECIMAL(6,2),
+            economy DECIMAL(6,2),
+            strike_rate DECIMAL(6,2),
+            bowling_figure DECIMAL(6,3),
+            runs INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(player_id, format_id)
+        );
+    """)
+    print("✅ Created 'bowling_stats' table")
+    
+    # 5. Canonical player identity: normalized name keys and recorded aliases
+    cursor.execute("""
+        ALTER TABLE players ADD COLUMN IF NOT EXISTS name_key VARCHAR(100);
+        ALTER TABLE players ADD COLUMN IF NOT EXISTS initials_key VARCHAR(100);
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS player_aliases (
+            alias_name VARCHAR(100) PRIMARY KEY,
+            player_id INTEGER REFERENCES players(player_id) ON DELETE CASCADE,
+            matched_by VARCHAR(20) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    cursor.execute("ALTER TABLE player_aliases ADD COLUMN IF NOT EXISTS alias_key VARCHAR(100);")
+    backfill_alias_keys(cursor)
+    merges = merge_duplicate_players(cursor)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_players_name_key ON players (name_key);
+        CREATE INDEX IF NOT EXISTS idx_players_initials_key ON players (initials_key);
+        CREATE INDEX IF NOT EXISTS idx_player_aliases_alias_key ON player_aliases (alias_key);
+    """)
+    print(f"✅ Added player identity keys ({len(merges)} duplicate players merged)")
+
+    # 6. Derived metrics as generated columns, and (format_id, metric DESC) indexes
+    #    so per-format leaderboards are index scans instead of full sorts
+    cursor.execute("""
+        ALTER TABLE batting_stats ADD COLUMN IF NOT EXISTS runs_per_innings NUMERIC
+            GENERATED ALWAYS AS (ROUND(runs * 1.0 / NULLIF(innings, 0), 2)) STORED;
+        ALTER TABLE batting_stats ADD COLUMN IF NOT EXISTS boundary_percentage NUMERIC
+            GENERATED ALWAYS AS (ROUND((fours * 4 + sixes * 6) * 100.0 / NULLIF(runs, 0), 2)) STORED;
+        ALTER TABLE bowling_stats ADD COLUMN IF NOT EXISTS wickets_per_match NUMERIC
+            GENERATED ALWAYS AS (ROUND(wickets * 1.0 / NULLIF(matches, 0), 2)) STORED;
+        CREATE INDEX IF NOT EXISTS idx_batting_format_runs ON batting_stats (format_id, runs DESC);
+        CREATE INDEX IF NOT EXISTS idx_batting_format_matches ON batting_stats (format_id, matches DESC);
+        CREATE INDEX IF NOT EXISTS idx_batting_format_strike_rate ON batting_stats (format_id, strike_rate DESC);
+        CREATE INDEX IF NOT EXISTS idx_batting_format_runs_per_innings ON batting_stats (format_id, runs_per_innings DESC);
+        CREATE INDEX IF NOT EXISTS idx_bowling_format_matches ON bowling_stats (format_id, matches DESC);
+        CREATE INDEX IF NOT EXISTS idx_bowling_format_wickets ON bowling_stats (format_id, wickets DESC);
+        CREATE INDEX IF NOT EXISTS idx_bowling_format_wickets_per_match ON bowling_stats (format_id, wickets_per_match DESC);
+    """)
+    print("✅ Added derived metric columns and leaderboard indexes")
+
+    # 7. Denormalized player profiles: one document per canonical player, read by primary key
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS player_profiles (
+            player_id INTEGER PRIMARY KEY REFERENCES players(player_id) ON DELETE CASCADE,
+            profile JSONB NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    profiles = rebuild_profiles(cursor)
+    print(f"✅ Created 'player_profiles' table ({profiles} profiles built)")
+
+    # 8. Dataset version: bumped with every load so readers (the stats service ETags) see changes
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS dataset_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO dataset_version (id, version) VALUES (1, 1) ON CONFLICT (id) DO NOTHING;
+    """)
+    if merges:
+        db.bump_data_version(cursor)
+    print(f"✅ Created 'dataset_version' table (version {db.data_version(cursor)})")
+
+    # 9. Insert default formats (Test and ODI)
+    cursor.execute("""
+        INSERT INTO formats (format_name) VALUES 
+        ('Test'), ('ODI')
+        ON CONFLICT (format_name) DO NOTHING;
+    """)
+    print("✅ Inserted default formats: Test and ODI")
+
 def create_database_tables():
-    """Create all necessary tables in Neon PostgreSQL database"""
+    """Create all necessary tables in the configured database (Neon PostgreSQL or embedded SQLite)"""
     
-    # Get database connection string from environment variable
-    database_url = os.getenv('DATABASE_URL')
+    backend = db.get_backend()
     
-    if not database_url:
+    # Get database connection string from environment variable
+    if backend == 'postgres' and not os.getenv('DATABASE_URL'):
         print("❌ DATABASE_URL not found in environment variables")
         print("Please add your Neon database connection string to .env file")
         return
     
     try:
-        # Connect to Neon PostgreSQL
-        conn = psycopg2.connect(database_url)
+        # Connect to Neon PostgreSQL (or the local SQLite file)
+        conn = db.connect(backend)
         cursor = conn.cursor()
         
-        print("✅ Connected to Neon Database successfully")
-        
-        # 1. Create Players table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS players (
-                player_id SERIAL PRIMARY KEY,
-                full_name VARCHAR(100) NOT NULL UNIQUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-        print("✅ Created 'players' table")
-        
-        # 2. Create Formats table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS formats (
-                format_id SERIAL PRIMARY KEY,
-                format_name VARCHAR(20) NOT NULL UNIQUE
-            );
-        """)
-        print("✅ Created 'formats' table")
+        print(f"✅ Connected to {'Neon' if backend == 'postgres' else 'SQLite'} Database successfully")
         
-        # 3. Create Batting Statistics table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS batting_stats (
-                batting_id SERIAL PRIMARY KEY,
-                player_id INTEGER REFERENCES players(player_id) ON DELETE CASCADE,
-                format_id INTEGER REFERENCES formats(format_id) ON DELETE CASCADE,
-                rank INTEGER,
-                matches INTEGER,
-                innings INTEGER,
-                runs INTEGER,
-                average DECIMAL(6,2),
-                strike_rate DECIMAL(6,2),
-                highest_score INTEGER,
-                fours INTEGER,
-                sixes INTEGER,
-                fifties INTEGER,
-                hundreds INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(player_id, format_id)
-            );
-        """)
-        print("✅ Created 'batting_stats' table")
-        
-        # 4. Create Bowling Statistics table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS bowling_stats (
-                bowling_id SERIAL PRIMARY KEY,
-                player_id INTEGER REFERENCES players(player_id) ON DELETE CASCADE,
-                format_id INTEGER REFERENCES formats(format_id) ON DELETE CASCADE,
-                rank INTEGER,
-                matches INTEGER,
-                innings INTEGER,
-                wickets INTEGER,
-                average DECIMAL(6,2),
-                economy DECIMAL(6,2),
-                strike_rate DECIMAL(6,2),
-                bowling_figure DECIMAL(6,3),
-                runs INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(player_id, format_id)
-            );
-        """)
-        print("✅ Created 'bowling_stats' table")
-        
-        # 5. Insert default formats (Test and ODI)
-        cursor.execute("""
-            INSERT INTO formats (format_name) VALUES 
-            ('Test'), ('ODI')
-            ON CONFLICT (format_name) DO NOTHING;
-        """)
-        print("✅ Inserted default formats: Test and ODI")
+        create_schema(cursor)
         
         # Commit changes
         conn.commit()
         print("🎉 All tables created successfully!")
         
         # Verify tables were created
-        cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public'
-            ORDER BY table_name;
-        """)
-        
-        tables = cursor.fetchall()
+        tables = db.list_tables(cursor)
         print("\n📊 Database Tables Created:")
         for table in tables:
-            print(f"   - {table[0]}")
+            print(f"   - {table}")
             
     except Exception as e:
         print(f"❌ Error creating tables: {e}")
@@ -126,23 +193,15 @@ def create_database_tables():
 def verify_tables():
     """Verify that tables are created and check their structure"""
     
-    database_url = os.getenv('DATABASE_URL')
-    
     try:
-        conn = psycopg2.connect(database_url)
+        conn = db.connect()
         cursor = conn.cursor()
         
         print("\n🔍 Verifying table structures...")
         
         # Check players table
-        cursor.execute("""
-            SELECT column_name, data_type 
-            FROM information_schema.columns 
-            WHERE table_name = 'players' 
-            ORDER BY ordinal_position;
-        """)
         print("\n📋 Players Table Structure:")
-        for col in cursor.fetchall():
+        for col in db.list_columns(cursor, 'players'):
             print(f"   - {col[0]}: {col[1]}")
         
         # Check formats table
@@ -161,6 +220,6 @@ def verify_tables():
             conn.close()
 
 if __name__ == "__main__":
-    print("🚀 Starting Neon Database Table Creation...")
+    print(f"🚀 Starting {'Neon' if db.get_backend() == 'postgres' else 'SQLite'} Database Table Creation...")
     create_database_tables()
     verify_tables()
\ No newline at end of file
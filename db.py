@@ -0,0 +1,346 @@
+import atexit
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# DB_BACKEND selects the engine: 'postgres' (Neon / any PostgreSQL, the default) or 'sqlite'
+DEFAULT_BACKEND = 'postgres'
+DEFAULT_SQLITE_PATH = 'cricket_stats.db'
+
+# PostgreSQL connections are pooled per process and kept alive between uses
+POOL_MAX_CONNECTIONS = int(os.getenv('DB_POOL_MAX', '5'))
+CONNECT_RETRIES = int(os.getenv('DB_CONNECT_RETRIES', '4'))
+CONNECT_BACKOFF_SECONDS = 0.5
+KEEPALIVE_OPTIONS = {
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 5,
+    'connect_timeout': 10,
+}
+
+# Keeps IN lists under SQLite's bound-parameter limit
+ID_CHUNK = 500
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+_ADD_COLUMN_IF_NOT_EXISTS = re.compile(
+    r"ALTER\s+TABLE\s+(\w+)\s+ADD\s+COLUMN\s+IF\s+NOT\s+EXISTS\s+(\w+)\s+(.*)", re.IGNORECASE | re.DOTALL
+)
+_SQL_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+def get_backend(backend=None):
+    """Resolve the backend name from the argument or the DB_BACKEND environment variable"""
+    backend = (backend or os.getenv('DB_BACKEND') or DEFAULT_BACKEND).lower()
+    if backend in ('postgres', 'postgresql', 'neon'):
+        return 'postgres'
+    if backend == 'sqlite':
+        return 'sqlite'
+    raise ValueError(f"Unsupported DB_BACKEND '{backend}' (use 'postgres' or 'sqlite')")
+
+
+def connect(backend=None, database_url=None):
+    """Open a DB-API connection for the selected backend
+
+    PostgreSQL uses DATABASE_URL and hands out connections from a shared keep-alive
+    pool, so TLS and session set-up happen once per process; close() returns the
+    connection to the pool. SQLite uses SQLITE_PATH (a file, or ':memory:').
+    Both accept the same `%s`-style SQL used throughout the project.
+    """
+    backend = get_backend(backend)
+    if backend == 'sqlite':
+        return SQLiteConnection(database_url or os.getenv('SQLITE_PATH', DEFAULT_SQLITE_PATH))
+
+    database_url = database_url or os.getenv('DATABASE_URL')
+    if not database_url:
+        raise RuntimeError("DATABASE_URL not found in environment variables")
+    return PooledConnection(_get_pool(database_url))
+
+
+def _retry(operation):
+    """Run operation, retrying with exponential backoff while the server is waking up
+
+    Neon suspends idle computes, so the first connection after a pause can fail or
+    time out while the compute starts.
+    """
+    import psycopg2
+
+    for attempt in range(CONNECT_RETRIES + 1):
+        try:
+            return operation()
+        except psycopg2.OperationalError as e:
+            if attempt == CONNECT_RETRIES:
+                raise
+            delay = CONNECT_BACKOFF_SECONDS * (2 ** attempt)
+            print(f"⏳ Database not reachable ({str(e).strip().splitlines()[0]}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+
+def _get_pool(database_url):
+    """The process-wide connection pool for a database URL, created on first use"""
+    with _pools_lock:
+        pool = _pools.get(database_url)
+        if pool is None:
+            from psycopg2.pool import ThreadedConnectionPool
+
+            pool = _retry(lambda: ThreadedConnectionPool(
+                1, POOL_MAX_CONNECTIONS, database_url, **KEEPALIVE_OPTIONS
+            ))
+            _pools[database_url] = pool
+        return pool
+
+
+@atexit.register
+def close_pools():
+    """Close every pooled connection (runs automatically at interpreter exit)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
+
+
+def connection_errors(backend=None):
+    """Exception types meaning the connection itself is unusable (worth reconnecting for)
+
+    SQLite connections are local files and don't drop, so nothing qualifies there.
+    """
+    if get_backend(backend) == 'sqlite':
+        return ()
+    import psycopg2
+
+    return (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+
+def dialect(conn_or_cursor):
+    """'sqlite' for the embedded backend, otherwise 'postgres'"""
+    return getattr(conn_or_cursor, 'dialect', 'postgres')
+
+
+def list_tables(cursor):
+    """Names of user tables, sorted"""
+    if dialect(cursor) == 'sqlite':
+        cursor.execute("""
+            SELECT name FROM sqlite_master
+            WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+            ORDER BY name
+        """)
+    else:
+        cursor.execute("""
+            SELECT table_name
+            FROM information_schema.tables
+            WHERE table_schema = 'public'
+            ORDER BY table_name;
+        """)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def list_columns(cursor, table):
+    """(column name, data type) pairs for a table in declaration order"""
+    if dialect(cursor) == 'sqlite':
+        cursor.execute(f"PRAGMA table_xinfo({table})")
+        return [(row[1], row[2]) for row in cursor.fetchall()]
+    cursor.execute("""
+        SELECT column_name, data_type
+        FROM information_schema.columns
+        WHERE table_name = %s
+        ORDER BY ordinal_position;
+    """, (table,))
+    return cursor.fetchall()
+
+
+def table_exists(cursor, table):
+    """True when the table exists; unlike catching the error, this leaves a PostgreSQL transaction usable"""
+    if dialect(cursor) == 'sqlite':
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", (table,))
+    else:
+        cursor.execute("SELECT 1 WHERE to_regclass(%s) IS NOT NULL", (table,))
+    return cursor.fetchone() is not None
+
+
+def data_version(cursor):
+    """Current dataset version (bumped by every load), or 0 before the schema exists"""
+    if not table_exists(cursor, 'dataset_version'):
+        return 0
+    cursor.execute("SELECT version FROM dataset_version WHERE id = 1")
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def bump_data_version(cursor):
+    """Mark the stats as changed; call inside the transaction that changes them"""
+    cursor.execute("UPDATE dataset_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1")
+
+
+def bulk_execute(cursor, sql, rows, page_size=500):
+    """Run one parameterized statement for many rows with as few round-trips as the backend allows"""
+    if dialect(cursor) == 'sqlite':
+        cursor.executemany(sql, rows)
+        return
+
+    from psycopg2.extras import execute_batch
+
+    execute_batch(cursor, sql, rows, page_size=page_size)
+
+
+def plain_value(value):
+    """JSON/Arrow-friendly value for a database value (Decimal -> float, dates -> ISO strings)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def translate_sql(sql):
+    """Rewrite the PostgreSQL flavour used in this project into SQLite SQL"""
+    sql = sql.replace('%s', '?')
+    sql = re.sub(r"\bSERIAL\s+PRIMARY\s+KEY\b", "INTEGER PRIMARY KEY AUTOINCREMENT", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bJSONB\b", "TEXT", sql, flags=re.IGNORECASE)
+    # PostgreSQL's code-point collation is SQLite's default
+    sql = re.sub(r'\bCOLLATE\s+"C"', "COLLATE BINARY", sql, flags=re.IGNORECASE)
+    return sql
+
+
+def _ping(conn):
+    """Round-trip a trivial query, leaving no transaction open"""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    conn.rollback()
+
+
+class PooledConnection:
+    """psycopg2 connection borrowed from a pool; close() gives it back instead of disconnecting"""
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._conn = _retry(self._checkout)
+
+    def _checkout(self):
+        """A pooled connection that answered a ping, discarding any the server dropped
+
+        `conn.closed` only notices connections closed from this side; one the server
+        dropped while it sat idle (restart, suspended compute) still looks open until
+        used. Every idle connection can be stale after a suspend, so keep replacing
+        them; if a fresh one fails too, the error reaches _retry.
+        """
+        for _ in range(POOL_MAX_CONNECTIONS):
+            conn = self._pool.getconn()
+            try:
+                _ping(conn)
+                return conn
+            except connection_errors('postgres'):
+                self._pool.putconn(conn, close=True)
+        conn = self._pool.getconn()
+        _ping(conn)
+        return conn
+
+    def close(self):
+        if self._conn is not None:
+            self._pool.putconn(self._conn, close=bool(self._conn.closed))
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __getattr__(self, name):
+        # cursor, commit, rollback, autocommit, ...
+        return getattr(self._conn, name)
+
+
+def split_statements(sql):
+    """Split a script on the semicolons that end statements (not those inside literals or comments)
+
+    Pieces holding only whitespace and comments (a trailing "-- note") are dropped:
+    executing one would replace the previous statement's result set with nothing.
+    """
+    statements, current = [], ""
+    for piece in sql.split(';'):
+        current += piece
+        if sqlite3.complete_statement(current + ';'):
+            if _has_statement(current):
+                statements.append(current)
+            current = ""
+        else:
+            current += ';'
+    if _has_statement(current):
+        statements.append(current)
+    return statements
+
+
+def _has_statement(piece):
+    """False when a piece of a script is only whitespace and comments"""
+    return bool(_SQL_COMMENTS.sub('', piece).strip())
+
+
+class SQLiteCursor:
+    """sqlite3 cursor that accepts the project's PostgreSQL-style SQL"""
+
+    dialect = 'sqlite'
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._cursor = connection.raw.cursor()
+
+    def execute(self, sql, params=None):
+        statements = [sql] if params else split_statements(sql)
+        for statement in statements:
+            match = _ADD_COLUMN_IF_NOT_EXISTS.search(statement)
+            if match:
+                table, column, definition = match.groups()
+                if column in {name for name, _ in list_columns(self, table)}:
+                    continue
+                # SQLite can only add generated columns as VIRTUAL (computed on read)
+                definition = re.sub(r"\bSTORED\b", "VIRTUAL", definition, flags=re.IGNORECASE)
+                statement = f"ALTER TABLE {table} ADD COLUMN {column} {definition}"
+            self._cursor.execute(translate_sql(statement), params or ())
+        return self
+
+    def executemany(self, sql, rows):
+        self._cursor.executemany(translate_sql(sql), rows)
+        return self
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        # fetchone, fetchall, fetchmany, rowcount, description, close, ...
+        return getattr(self._cursor, name)
+
+
+class SQLiteConnection:
+    """Embedded SQLite connection with the same surface as a psycopg2 connection"""
+
+    dialect = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self.raw = sqlite3.connect(path)
+        self.raw.execute("PRAGMA foreign_keys = ON")
+        # LIKE is case-sensitive in PostgreSQL; match it so searches return the same rows
+        self.raw.execute("PRAGMA case_sensitive_like = ON")
+
+    def cursor(self):
+        return SQLiteCursor(self)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        self.raw.close()
+
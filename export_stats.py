@@ -0,0 +1,251 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+
+import db
+
+load_dotenv()
+
+# Rows fetched per round trip; memory use is bounded by this, not by the result size
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '5000'))
+
+# Exportable datasets: SELECT without filters, table alias, and the columns a metric filter may use
+DATASETS = {
+    'batting': ("""
+        SELECT p.full_name, f.format_name, bs.rank, bs.matches, bs.innings, bs.runs,
+               bs.average, bs.strike_rate, bs.highest_score, bs.fours, bs.sixes,
+               bs.fifties, bs.hundreds, bs.runs_per_innings, bs.boundary_percentage
+        FROM batting_stats bs
+        JOIN players p ON bs.player_id = p.player_id
+        JOIN formats f ON bs.format_id = f.format_id
+    """, 'bs', ['rank', 'matches', 'innings', 'runs', 'average', 'strike_rate',
+                'highest_score', 'fours', 'sixes', 'fifties', 'hundreds',
+                'runs_per_innings', 'boundary_percentage']),
+    'bowling': ("""
+        SELECT p.full_name, f.format_name, bws.rank, bws.matches, bws.innings, bws.wickets,
+               bws.average, bws.economy, bws.strike_rate, bws.bowling_figure, bws.runs,
+               bws.wickets_per_match
+        FROM bowling_stats bws
+        JOIN players p ON bws.player_id = p.player_id
+        JOIN formats f ON bws.format_id = f.format_id
+    """, 'bws', ['rank', 'matches', 'innings', 'wickets', 'average', 'economy',
+                 'strike_rate', 'bowling_figure', 'runs', 'wickets_per_match']),
+    'players': ("""
+        SELECT p.player_id, p.full_name, p.name_key
+        FROM players p
+    """, 'p', []),
+}
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+# Parquet column types of the dataset columns, so every row group shares one schema even
+# when a batch is all NULL or (SQLite NUMERIC affinity) all whole numbers
+COLUMN_TYPES = {
+    'full_name': 'string', 'format_name': 'string', 'name_key': 'string',
+    'player_id': 'int64', 'rank': 'int64', 'matches': 'int64', 'innings': 'int64', 'runs': 'int64',
+    'highest_score': 'int64', 'fours': 'int64', 'sixes': 'int64', 'fifties': 'int64',
+    'hundreds': 'int64', 'wickets': 'int64',
+    'average': 'float64', 'strike_rate': 'float64', 'economy': 'float64', 'bowling_figure': 'float64',
+    'runs_per_innings': 'float64', 'boundary_percentage': 'float64', 'wickets_per_match': 'float64',
+}
+
+# Parquet types for other columns by PostgreSQL type OID (cursor.description type_code)
+_PG_COLUMN_TYPES = {
+    16: 'bool', 20: 'int64', 21: 'int64', 23: 'int64',
+    700: 'float64', 701: 'float64', 1700: 'float64',
+    25: 'string', 1042: 'string', 1043: 'string',
+}
+
+
+def build_export_query(dataset, formats=None, metric=None, minimum=None):
+    """SQL and params for a dataset, optionally filtered by format and a metric minimum"""
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset}' (choose from {', '.join(DATASETS)})")
+    sql, alias, metrics = DATASETS[dataset]
+    clauses, params = [], []
+    if formats:
+        if dataset == 'players':
+            raise ValueError("The players dataset has no format to filter on")
+        clauses.append(f"f.format_name IN ({', '.join(['%s'] * len(formats))})")
+        params.extend(formats)
+    if metric:
+        if metric not in metrics:
+            raise ValueError(f"Unknown metric '{metric}' for {dataset} (choose from {', '.join(metrics)})")
+        if minimum is not None:
+            clauses.append(f"{alias}.{metric} >= %s")
+            params.append(minimum)
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    if metric:
+        order = f"{alias}.{metric} DESC"
+    else:
+        order = "p.player_id" if dataset == 'players' else "f.format_name, p.full_name"
+    return f"{sql.rstrip()} ORDER BY {order}", params
+
+
+def stream_query(conn, sql, params=None, batch_size=EXPORT_BATCH_SIZE):
+    """The cursor description and an iterator of row batches for a query
+
+    PostgreSQL uses a named (server-side) cursor so rows stay on the server until fetched;
+    sqlite3 cursors already step through results lazily.
+    """
+    if db.dialect(conn) == 'sqlite':
+        cursor = conn.cursor()
+    else:
+        cursor = conn.cursor(name='export_stream')
+        cursor.itersize = batch_size
+    cursor.execute(sql, params or None)
+    # Named cursors only describe their columns after the first fetch
+    first = cursor.fetchmany(batch_size)
+    description = cursor.description
+
+    def batches():
+        try:
+            batch = first
+            while batch:
+                yield batch
+                batch = cursor.fetchmany(batch_size)
+        finally:
+            cursor.close()
+
+    return description, batches()
+
+
+def write_csv(columns, batches, out):
+    writer = csv.writer(out)
+    writer.writerow(columns)
+    count = 0
+    for batch in batches:
+        writer.writerows(batch)
+        count += len(batch)
+    return count
+
+
+def write_jsonl(columns, batches, out):
+    count = 0
+    for batch in batches:
+        for row in batch:
+            out.write(json.dumps({c: db.plain_value(v) for c, v in zip(columns, row)}) + '\n')
+        count += len(batch)
+    return count
+
+
+def parquet_schema(description):
+    """Arrow schema for a cursor description
+
+    Dataset columns use COLUMN_TYPES, other PostgreSQL columns their type OID; anything
+    else (e.g. computed columns on SQLite, which reports no types) is written as text.
+    """
+    import pyarrow as pa
+
+    return pa.schema([
+        pa.field(name, pa.type_for_alias(COLUMN_TYPES.get(name) or _PG_COLUMN_TYPES.get(type_code, 'string')))
+        for name, type_code, *_ in description
+    ])
+
+
+def write_parquet(schema, batches, path):
+    """Write batches as row groups of one fixed schema so only one batch is held in memory"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in batches:
+            arrays = []
+            for field, column in zip(schema, zip(*batch)):
+                values = [db.plain_value(v) for v in column]
+                if pa.types.is_string(field.type):
+                    values = [None if v is None else str(v) for v in values]
+                arrays.append(pa.array(values, type=field.type))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            count += len(batch)
+    return count
+
+
+def copy_csv(conn, sql, params, out):
+    """Stream a query as CSV with COPY ... TO STDOUT (PostgreSQL only)"""
+    cursor = conn.cursor()
+    try:
+        query = cursor.mogrify(sql, params or None).decode()
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH CSV HEADER", out)
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def export_query(conn, sql, params, export_format, output='-', batch_size=EXPORT_BATCH_SIZE):
+    """Stream any query to CSV, JSON Lines or Parquet; returns the number of rows written"""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{export_format}' (choose from {', '.join(EXPORT_FORMATS)})")
+    if export_format == 'parquet':
+        if output == '-':
+            raise ValueError("Parquet exports need an output file")
+        description, batches = stream_query(conn, sql, params, batch_size)
+        try:
+            return write_parquet(parquet_schema(description), batches, output)
+        finally:
+            batches.close()
+
+    out = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8', newline='')
+    try:
+        if export_format == 'csv' and db.dialect(conn) == 'postgres':
+            return copy_csv(conn, sql, params, out)
+        description, batches = stream_query(conn, sql, params, batch_size)
+        writer = write_csv if export_format == 'csv' else write_jsonl
+        try:
+            return writer([column[0] for column in description], batches, out)
+        finally:
+            batches.close()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def export_dataset(conn, dataset, export_format, output='-', formats=None, metric=None,
+                   minimum=None, batch_size=EXPORT_BATCH_SIZE):
+    """Stream a filtered dataset; returns the number of rows written"""
+    sql, params = build_export_query(dataset, formats, metric, minimum)
+    return export_query(conn, sql, params, export_format, output, batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream stats tables to CSV, JSON Lines or Parquet")
+    parser.add_argument('dataset', choices=list(DATASETS))
+    parser.add_argument('--output', '-o', default='-', help="output file ('-' for stdout)")
+    parser.add_argument('--as', dest='export_format', choices=EXPORT_FORMATS,
+                        help="output format (default: from the file extension, else csv)")
+    parser.add_argument('--format', dest='formats', action='append', help="cricket format, repeatable")
+    parser.add_argument('--metric', help="order by this metric (descending)")
+    parser.add_argument('--min', dest='minimum', type=float, help="only rows with metric >= this value")
+    parser.add_argument('--batch-size', type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    export_format = args.export_format
+    if export_format is None:
+        extension = os.path.splitext(args.output)[1].lstrip('.').lower()
+        export_format = extension if extension in EXPORT_FORMATS else 'csv'
+    if args.minimum is not None and not args.metric:
+        parser.error("--min needs --metric")
+
+    try:
+        build_export_query(args.dataset, args.formats, args.metric, args.minimum)
+    except ValueError as e:
+        parser.error(str(e))
+
+    conn = db.connect()
+    try:
+        count = export_dataset(conn, args.dataset, export_format, args.output, args.formats,
+                               args.metric, args.minimum, args.batch_size)
+    finally:
+        conn.close()
+    if args.output != '-':
+        print(f"✅ Exported {count} {args.dataset} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
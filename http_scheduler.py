@@ -0,0 +1,178 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# Politeness limits per host; every scraper fetch in the process shares them
+REQUESTS_PER_SECOND = float(os.getenv('SCRAPE_REQUESTS_PER_SECOND', '1'))
+BURST = int(os.getenv('SCRAPE_BURST', '2'))
+MAX_CONCURRENT_PER_HOST = int(os.getenv('SCRAPE_MAX_CONCURRENT_PER_HOST', '2'))
+
+# (connect, read) timeouts in seconds
+REQUEST_TIMEOUT = (
+    float(os.getenv('SCRAPE_CONNECT_TIMEOUT', '10')),
+    float(os.getenv('SCRAPE_READ_TIMEOUT', '30')),
+)
+MAX_RETRIES = int(os.getenv('SCRAPE_MAX_RETRIES', '5'))
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 60.0
+
+# Throttling and transient server errors are retried; other 4xx are not
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+USER_AGENT = os.getenv('SCRAPE_USER_AGENT', 'bcci-stats-scraper (+https://www.bcci.tv)')
+
+_default = None
+_default_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `burst` banked"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    wait = self._paused_until - now
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hand out no tokens for `seconds` (the host asked us to back off)"""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = self._paused_until
+
+
+class _Host:
+    """Concurrency cap and rate limit for one host"""
+
+    def __init__(self, rate, burst, max_concurrent):
+        self.bucket = TokenBucket(rate, burst)
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+
+
+def _retry_after(response):
+    """Seconds requested by a Retry-After header (delta or HTTP date), or None"""
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """Rate-limited, retrying HTTP fetches shared by all scrapers
+
+    Each host gets a token bucket (REQUESTS_PER_SECOND, BURST) and a cap on requests in
+    flight. 429 and 5xx responses and connection errors are retried with jittered
+    exponential backoff, honouring Retry-After; a 429 also pauses the whole host.
+    """
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, burst=BURST, max_concurrent=MAX_CONCURRENT_PER_HOST,
+                 retries=MAX_RETRIES, timeout=REQUEST_TIMEOUT, session=None):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.retries = retries
+        self.timeout = timeout
+        self._session = session
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _Host(self.rate, self.burst, self.max_concurrent)
+            return self._hosts[host]
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+            self._session.headers['User-Agent'] = USER_AGENT
+        return self._session
+
+    @contextmanager
+    def slot(self, url):
+        """Hold one of the host's concurrency slots after waiting for a rate-limit token
+
+        Used directly for fetches the scheduler does not make itself (browser page loads).
+        """
+        host = self._host(url)
+        with host.slots:
+            host.bucket.acquire()
+            yield
+
+    def backoff(self, attempt, response=None):
+        """Full-jitter exponential delay for a retry, but never less than Retry-After"""
+        delay = random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+        retry_after = _retry_after(response)
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    def get(self, url, **kwargs):
+        """GET a URL politely; returns a successful response or raises"""
+        import requests
+
+        kwargs.setdefault('timeout', self.timeout)
+        for attempt in range(self.retries + 1):
+            response, error = None, None
+            with self.slot(url):
+                try:
+                    response = self.session.get(url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                return response
+            if attempt == self.retries:
+                if response is not None:
+                    response.raise_for_status()
+                raise error
+
+            delay = self.backoff(attempt, response)
+            reason = f"HTTP {response.status_code}" if response is not None else type(error).__name__
+            if response is not None and response.status_code == 429:
+                self._host(url).bucket.pause(delay)
+            print(f"⏳ {reason} from {urlsplit(url).netloc}, retrying in {delay:.1f}s "
+                  f"({attempt + 1}/{self.retries})")
+            time.sleep(delay)
+
+
+def default_scheduler():
+    """The process-wide scheduler, so concurrent scraper jobs share per-host limits"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = RequestScheduler()
+        return _default
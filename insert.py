@@ -1,22 +1,33 @@
-import psycopg2
-import pandas as pd
+import math
 import os
 from dotenv import load_dotenv
 
+import db
+from player_identity import PlayerResolver
+from player_profiles import rebuild_profiles
+
 # Load environment variables
 load_dotenv()
 
 class DataInserter:
-    def __init__(self):
-        self.database_url = os.getenv('DATABASE_URL')
+    def __init__(self, backend=None, database_url=None):
+        self.backend = db.get_backend(backend)
+        self.database_url = database_url
         self.conn = None
         self.cursor = None
+        self.resolver = None
+        self.format_ids = {}
+        # Canonical ids of players whose stats were written since the last take_touched_players()
+        self.touched_players = set()
+        # Batches that failed to load (the error is printed and the batch rolled back)
+        self.failed_loads = 0
     
     def connect(self):
-        """Connect to Neon PostgreSQL database"""
+        """Connect to Neon PostgreSQL (or the embedded SQLite backend)"""
         try:
-            self.conn = psycopg2.connect(self.database_url)
+            self.conn = db.connect(self.backend, self.database_url)
             self.cursor = self.conn.cursor()
+            self.resolver = PlayerResolver(self.cursor).load()
             print("✅ Connected to database successfully")
         except Exception as e:
             print(f"❌ Database connection failed: {e}")
@@ -39,6 +50,8 @@ class DataInserter:
             'csv_files/bowling_most_wickets_odi.csv'
         ]
         
+        import pandas as pd
+        
         print("\n🔍 Checking CSV files...")
         for file in csv_files:
             if os.path.exists(file):
@@ -56,10 +69,14 @@ class DataInserter:
         }
         
         proper_format_name = format_mapping.get(format_name.lower(), format_name)
+        if proper_format_name in self.format_ids:
+            return self.format_ids[proper_format_name]
+        
         self.cursor.execute("SELECT format_id FROM formats WHERE format_name = %s", (proper_format_name,))
         result = self.cursor.fetchone()
         
         if result:
+            self.format_ids[proper_format_name] = result[0]
             return result[0]
         else:
             print(f"⚠️  Format '{format_name}' not found in database. Available formats:")
@@ -69,38 +86,24 @@ class DataInserter:
                 print(f"   - {fmt[0]}")
             return None
     
+    def take_touched_players(self):
+        """Players whose stats changed since the last call (for incremental consumers)"""
+        touched, self.touched_players = self.touched_players, set()
+        return touched
+    
     def insert_player(self, player_name):
-        """Insert player and return player_id"""
+        """Resolve player to its canonical identity (inserting if new) and return player_id"""
         try:
-            # Clean player name
-            player_name = str(player_name).strip()
-            if not player_name or player_name == 'nan' or player_name == '0':
-                return None
-                
-            # First check if player exists
-            self.cursor.execute("SELECT player_id FROM players WHERE full_name = %s", (player_name,))
-            existing_player = self.cursor.fetchone()
-            
-            if existing_player:
-                return existing_player[0]
-            else:
-                # Insert new player
-                self.cursor.execute(
-                    "INSERT INTO players (full_name) VALUES (%s) RETURNING player_id",
-                    (player_name,)
-                )
-                result = self.cursor.fetchone()
-                player_id = result[0] if result else None
-                return player_id
-                
+            return self.resolver.resolve(player_name)
         except Exception as e:
             print(f"❌ Failed to insert player {player_name}: {e}")
             self.conn.rollback()
+            self.resolver.load()
             return None
     
     def clean_numeric_value(self, value, default=0):
         """Clean numeric values, handle NaN and convert to appropriate type"""
-        if pd.isna(value) or value == '' or value == 'nan':
+        if value is None or (isinstance(value, float) and math.isnan(value)) or value == '' or value == 'nan':
             return default
         try:
             # Remove commas and convert to appropriate type
@@ -113,27 +116,33 @@ class DataInserter:
     
     def load_batting_data(self, format_name):
         """Load batting data from CSV files with exact column mapping"""
+        import pandas as pd
+        
+        filename = f"csv_files/batting_most_runs_{format_name.lower()}.csv"
+        
+        if not os.path.exists(filename):
+            print(f"❌ CSV file not found: {filename}")
+            return
+        
+        df = pd.read_csv(filename)
+        print(f"\n📥 Loading {format_name.upper()} batting data...")
+        print(f"   Found {len(df)} records in CSV")
+        self.load_batting_rows(format_name, df.to_dict('records'))
+    
+    def load_batting_rows(self, format_name, rows):
+        """Upsert typed batting rows (dicts keyed by CSV column) in one batch and return the count loaded"""
         try:
-            filename = f"csv_files/batting_most_runs_{format_name.lower()}.csv"
-            
-            if not os.path.exists(filename):
-                print(f"❌ CSV file not found: {filename}")
-                return
-            
-            df = pd.read_csv(filename)
             format_id = self.get_format_id(format_name)
             
             if not format_id:
                 print(f"❌ Cannot load data - format not found: {format_name}")
-                return
-            
-            print(f"\n📥 Loading {format_name.upper()} batting data...")
-            print(f"   Found {len(df)} records in CSV")
+                self.failed_loads += 1
+                return 0
             
-            records_loaded = 0
+            records = []
             skipped_players = 0
             
-            for index, row in df.iterrows():
+            for row in rows:
                 player_name = str(row['Player']).strip()
                 
                 # Skip if player name is invalid
@@ -157,65 +166,81 @@ class DataInserter:
                     fifties = self.clean_numeric_value(row['50s'])
                     hundreds = self.clean_numeric_value(row['100s'])
                     
-                    # Insert batting stats with exact column names
-                    self.cursor.execute("""
-                        INSERT INTO batting_stats 
-                        (player_id, format_id, rank, matches, innings, runs, average, 
-                         strike_rate, highest_score, fours, sixes, fifties, hundreds)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (player_id, format_id) DO UPDATE SET
-                        rank = EXCLUDED.rank,
-                        matches = EXCLUDED.matches,
-                        innings = EXCLUDED.innings,
-                        runs = EXCLUDED.runs,
-                        average = EXCLUDED.average,
-                        strike_rate = EXCLUDED.strike_rate,
-                        highest_score = EXCLUDED.highest_score,
-                        fours = EXCLUDED.fours,
-                        sixes = EXCLUDED.sixes,
-                        fifties = EXCLUDED.fifties,
-                        hundreds = EXCLUDED.hundreds
-                    """, (
+                    records.append((
                         player_id, format_id, rank, matches, innings, runs, 
                         average, strike_rate, highest_score, fours, sixes, 
                         fifties, hundreds
                     ))
-                    records_loaded += 1
             
+            # Upsert batting stats with exact column names
+            db.bulk_execute(self.cursor, """
+                INSERT INTO batting_stats 
+                (player_id, format_id, rank, matches, innings, runs, average, 
+                 strike_rate, highest_score, fours, sixes, fifties, hundreds)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (player_id, format_id) DO UPDATE SET
+                rank = EXCLUDED.rank,
+                matches = EXCLUDED.matches,
+                innings = EXCLUDED.innings,
+                runs = EXCLUDED.runs,
+                average = EXCLUDED.average,
+                strike_rate = EXCLUDED.strike_rate,
+                highest_score = EXCLUDED.highest_score,
+                fours = EXCLUDED.fours,
+                sixes = EXCLUDED.sixes,
+                fifties = EXCLUDED.fifties,
+                hundreds = EXCLUDED.hundreds
+            """, records)
+            
+            # Refresh the profiles of exactly these players in the same transaction
+            player_ids = {record[0] for record in records}
+            rebuild_profiles(self.cursor, player_ids)
+            db.bump_data_version(self.cursor)
             self.conn.commit()
-            print(f"   ✅ Successfully loaded: {records_loaded} records")
+            self.touched_players.update(player_ids)
+            print(f"   ✅ Successfully loaded: {len(records)} records")
             if skipped_players > 0:
                 print(f"   ⚠️  Skipped: {skipped_players} invalid player names")
+            return len(records)
             
         except Exception as e:
             self.conn.rollback()
+            self.resolver.load()
+            self.failed_loads += 1
             print(f"❌ Failed to load {format_name} batting data: {e}")
             import traceback
             traceback.print_exc()
+            return 0
     
     def load_bowling_data(self, format_name):
         """Load bowling data from CSV files with exact column mapping"""
+        import pandas as pd
+        
+        filename = f"csv_files/bowling_most_wickets_{format_name.lower()}.csv"
+        
+        if not os.path.exists(filename):
+            print(f"❌ CSV file not found: {filename}")
+            return
+        
+        df = pd.read_csv(filename)
+        print(f"\n📥 Loading {format_name.upper()} bowling data...")
+        print(f"   Found {len(df)} records in CSV")
+        self.load_bowling_rows(format_name, df.to_dict('records'))
+    
+    def load_bowling_rows(self, format_name, rows):
+        """Upsert typed bowling rows (dicts keyed by CSV column) in one batch and return the count loaded"""
         try:
-            filename = f"csv_files/bowling_most_wickets_{format_name.lower()}.csv"
-            
-            if not os.path.exists(filename):
-                print(f"❌ CSV file not found: {filename}")
-                return
-            
-            df = pd.read_csv(filename)
             format_id = self.get_format_id(format_name)
             
             if not format_id:
                 print(f"❌ Cannot load data - format not found: {format_name}")
-                return
+                self.failed_loads += 1
+                return 0
             
-            print(f"\n📥 Loading {format_name.upper()} bowling data...")
-            print(f"   Found {len(df)} records in CSV")
-            
-            records_loaded = 0
+            records = []
             skipped_players = 0
             
-            for index, row in df.iterrows():
+            for row in rows:
                 player_name = str(row['Player']).strip()
                 
                 # Skip if player name is invalid
@@ -237,38 +262,48 @@ class DataInserter:
                     bowling_figure = self.clean_numeric_value(row['Bowling_Figure'], 0.0)
                     runs = self.clean_numeric_value(row['Runs'])
                     
-                    # Insert bowling stats with exact column names
-                    self.cursor.execute("""
-                        INSERT INTO bowling_stats 
-                        (player_id, format_id, rank, matches, innings, wickets, average, 
-                         economy, strike_rate, bowling_figure, runs)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (player_id, format_id) DO UPDATE SET
-                        rank = EXCLUDED.rank,
-                        matches = EXCLUDED.matches,
-                        innings = EXCLUDED.innings,
-                        wickets = EXCLUDED.wickets,
-                        average = EXCLUDED.average,
-                        economy = EXCLUDED.economy,
-                        strike_rate = EXCLUDED.strike_rate,
-                        bowling_figure = EXCLUDED.bowling_figure,
-                        runs = EXCLUDED.runs
-                    """, (
+                    records.append((
                         player_id, format_id, rank, matches, innings, wickets,
                         average, economy, strike_rate, bowling_figure, runs
                     ))
-                    records_loaded += 1
             
+            # Upsert bowling stats with exact column names
+            db.bulk_execute(self.cursor, """
+                INSERT INTO bowling_stats 
+                (player_id, format_id, rank, matches, innings, wickets, average, 
+                 economy, strike_rate, bowling_figure, runs)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (player_id, format_id) DO UPDATE SET
+                rank = EXCLUDED.rank,
+                matches = EXCLUDED.matches,
+                innings = EXCLUDED.innings,
+                wickets = EXCLUDED.wickets,
+                average = EXCLUDED.average,
+                economy = EXCLUDED.economy,
+                strike_rate = EXCLUDED.strike_rate,
+                bowling_figure = EXCLUDED.bowling_figure,
+                runs = EXCLUDED.runs
+            """, records)
+            
+            # Refresh the profiles of exactly these players in the same transaction
+            player_ids = {record[0] for record in records}
+            rebuild_profiles(self.cursor, player_ids)
+            db.bump_data_version(self.cursor)
             self.conn.commit()
-            print(f"   ✅ Successfully loaded: {records_loaded} records")
+            self.touched_players.update(player_ids)
+            print(f"   ✅ Successfully loaded: {len(records)} records")
             if skipped_players > 0:
                 print(f"   ⚠️  Skipped: {skipped_players} invalid player names")
+            return len(records)
             
         except Exception as e:
             self.conn.rollback()
+            self.resolver.load()
+            self.failed_loads += 1
             print(f"❌ Failed to load {format_name} bowling data: {e}")
             import traceback
             traceback.print_exc()
+            return 0
     
     def verify_data_loaded(self):
         """Verify that data has been loaded successfully"""
@@ -290,9 +325,8 @@ class DataInserter:
                 GROUP BY f.format_name
                 ORDER BY f.format_name
             """)
-            batting_counts = self.cursor.fetchall()
             print("\n🏏 BATTING RECORDS:")
-            for format_name, count in batting_counts:
+            for format_name, count in self.cursor:
                 print(f"   {format_name}: {count} records")
             
             # Check bowling stats count by format
@@ -303,16 +337,14 @@ class DataInserter:
                 GROUP BY f.format_name
                 ORDER BY f.format_name
             """)
-            bowling_counts = self.cursor.fetchall()
             print("\n🎯 BOWLING RECORDS:")
-            for format_name, count in bowling_counts:
+            for format_name, count in self.cursor:
                 print(f"   {format_name}: {count} records")
             
             # Show sample data
             print("\n👥 SAMPLE PLAYERS (first 5):")
             self.cursor.execute("SELECT full_name FROM players ORDER BY player_id LIMIT 5")
-            sample_players = self.cursor.fetchall()
-            for player in sample_players:
+            for player in self.cursor:
                 print(f"   - {player[0]}")
                 
             print("\n📈 SAMPLE BATTING STATS (Top run-scorers):")
@@ -324,8 +356,7 @@ class DataInserter:
                 ORDER BY bs.runs DESC
                 LIMIT 5
             """)
-            sample_batting = self.cursor.fetchall()
-            for player, format_name, runs, average, matches in sample_batting:
+            for player, format_name, runs, average, matches in self.cursor:
                 print(f"   - {player} ({format_name}): {runs} runs, {matches} matches, Avg: {average}")
                 
             print("\n🎯 SAMPLE BOWLING STATS (Top wicket-takers):")
@@ -337,8 +368,7 @@ class DataInserter:
                 ORDER BY bws.wickets DESC
                 LIMIT 5
             """)
-            sample_bowling = self.cursor.fetchall()
-            for player, format_name, wickets, average, matches in sample_bowling:
+            for player, format_name, wickets, average, matches in self.cursor:
                 print(f"   - {player} ({format_name}): {wickets} wickets, {matches} matches, Avg: {average}")
                 
         except Exception as e:
@@ -361,6 +391,9 @@ def main():
             inserter.load_batting_data(format_name)
             inserter.load_bowling_data(format_name)
         
+        # Report names merged into existing players
+        inserter.resolver.print_merge_report()
+        
         # Verify data loaded
         inserter.verify_data_loaded()
         
@@ -0,0 +1,158 @@
+import argparse
+import queue
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from insert import DataInserter
+from query import top_batsmen_by_runs, top_bowlers_by_matches
+from ranking_engine import RankingEngine, print_leaderboards
+
+# Batting and bowling tables for a format live on the same stats page
+STATS_URLS = {
+    "test": "https://www.bcci.tv/international/men/stats/test",
+    "odi": "https://www.bcci.tv/international/men/stats/odi",
+}
+
+# One unit of work on the queue: typed rows for one stats table and format
+RowBatch = namedtuple('RowBatch', ['kind', 'format_name', 'rows'])
+
+# Put on the queue by each scraper job when it finishes (successfully or not)
+_JOB_DONE = object()
+
+# How often a producer blocked on a full queue checks whether the loader has given up
+_PUT_POLL_SECONDS = 0.5
+
+
+def batting_job(format_name, batch_size):
+    """Batches of typed batting rows for one format"""
+    from test_odi_batting import iter_batting_batches
+
+    for rows in iter_batting_batches(format_name, STATS_URLS[format_name], batch_size):
+        yield RowBatch('batting', format_name, rows)
+
+
+def bowling_job(format_name, batch_size):
+    """Batches of typed bowling rows for one format"""
+    from test_odi_bowling import iter_bowling_batches
+
+    for rows in iter_bowling_batches(format_name, STATS_URLS[format_name], batch_size):
+        yield RowBatch('bowling', format_name, rows)
+
+
+def _put(batches, item, stop):
+    """Put onto the bounded queue, giving up once stop is set; returns whether it was queued"""
+    while not stop.is_set():
+        try:
+            batches.put(item, timeout=_PUT_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(job, batches, stop):
+    """Run one scraper job, feeding its batches into the bounded queue; returns whether it succeeded"""
+    try:
+        for batch in job:
+            # Blocks while the loader is behind, so scraped rows never pile up in memory
+            if not _put(batches, batch, stop):
+                return False
+        return True
+    except Exception as e:
+        print(f"❌ Scraper job failed: {e}")
+        return False
+    finally:
+        try:
+            job.close()
+        finally:
+            # Always signal the loader, or it would wait for this job forever
+            _put(batches, _JOB_DONE, stop)
+
+
+def refresh_leaderboards(cursor, ranking=None):
+    """Recompute the leaderboards once every batch has been loaded (plus composite rankings)"""
+    print("\n🏆 LEADERBOARDS")
+    print("-" * 40)
+    for i, (name, runs, _, format_name) in enumerate(top_batsmen_by_runs(cursor, 5), 1):
+        print(f"  {i}. {name} - {runs} runs ({format_name})")
+    print()
+    for i, (name, matches, format_name) in enumerate(top_bowlers_by_matches(cursor, 5), 1):
+        print(f"  {i}. {name} - {matches} matches ({format_name})")
+    if ranking is not None:
+        print_leaderboards(ranking)
+
+
+def run_pipeline(formats=('test', 'odi'), batch_size=100, queue_size=8, workers=4, backend=None, database_url=None):
+    """Scrape every format concurrently while a single loader bulk-writes batches as they arrive
+
+    Returns the number of jobs that failed: the scraper raised, or a batch failed to load.
+    """
+    jobs = {('batting', fmt): batting_job(fmt, batch_size) for fmt in formats}
+    jobs.update({('bowling', fmt): bowling_job(fmt, batch_size) for fmt in formats})
+    batches = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    inserter = DataInserter(backend, database_url)
+    start = time.perf_counter()
+    loaded = 0
+    failed_jobs = set()
+
+    try:
+        inserter.connect()
+        # Scored once up front; each batch then only rescores the players it touched
+        ranking = RankingEngine().load(inserter.cursor)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            producers = {key: pool.submit(_produce, job, batches, stop) for key, job in jobs.items()}
+            try:
+                pending = len(jobs)
+                while pending:
+                    batch = batches.get()
+                    if batch is _JOB_DONE:
+                        pending -= 1
+                        continue
+                    print(f"\n📥 Loading {len(batch.rows)} {batch.format_name.upper()} {batch.kind} rows...")
+                    failed_loads = inserter.failed_loads
+                    if batch.kind == 'batting':
+                        loaded += inserter.load_batting_rows(batch.format_name, batch.rows)
+                    else:
+                        loaded += inserter.load_bowling_rows(batch.format_name, batch.rows)
+                    if inserter.failed_loads > failed_loads:
+                        # The loader rolled the batch back; the job's data is incomplete
+                        failed_jobs.add((batch.kind, batch.format_name))
+                    ranking.refresh(inserter.cursor, inserter.take_touched_players())
+            except BaseException:
+                # Unblock producers waiting on the full queue so leaving the pool can't hang
+                stop.set()
+                raise
+            failed_jobs.update(key for key, producer in producers.items() if not producer.result())
+
+        inserter.resolver.print_merge_report()
+        refresh_leaderboards(inserter.cursor, ranking)
+        elapsed = time.perf_counter() - start
+        if failed_jobs:
+            names = ', '.join(f"{fmt.upper()} {kind}" for kind, fmt in sorted(failed_jobs))
+            print(f"\n⚠️ PIPELINE FINISHED WITH ERRORS: {len(failed_jobs)} of {len(jobs)} jobs failed ({names}), "
+                  f"{loaded} records in {elapsed:.1f}s")
+        else:
+            print(f"\n🎉 PIPELINE COMPLETED: {loaded} records in {elapsed:.1f}s")
+        return len(failed_jobs)
+    finally:
+        inserter.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape BCCI stats and load them without CSV files")
+    parser.add_argument('--formats', nargs='+', default=['test', 'odi'], choices=sorted(STATS_URLS))
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--queue-size', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    if run_pipeline(args.formats, args.batch_size, args.queue_size, args.workers):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    print("🚀 Starting streaming scrape → load pipeline...")
+    main()
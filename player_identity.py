@@ -0,0 +1,207 @@
+import re
+import unicodedata
+
+# Anything that is not a letter, digit or whitespace separates name tokens
+_SEPARATORS = re.compile(r"[^\w\s]|_")
+
+# Every key a player can be looked up by: the canonical name key and each alias's key.
+# Queries join requested name keys against it so any recorded spelling finds the player.
+PLAYER_KEYS_CTE = """player_keys(name_key, player_id) AS (
+        SELECT name_key, player_id FROM players
+        UNION
+        SELECT alias_key, player_id FROM player_aliases WHERE alias_key IS NOT NULL
+    )"""
+
+
+def _tokens(name):
+    """Split a raw name into (lowercase token, is_initials) pairs
+
+    Initials are tokens written with dots ("M.S."), single letters ("M S"), or a short
+    all-caps token ("MS") inside a name that is not itself written in all caps.
+    """
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    all_caps = text.upper() == text
+    tokens = []
+    for raw in text.split():
+        dotted = "." in raw
+        for part in _SEPARATORS.sub(" ", raw).split():
+            is_initials = (
+                len(part) == 1
+                or (dotted and len(part) <= 3)
+                or (not all_caps and part.isupper() and len(part) <= 3)
+            )
+            tokens.append((part.lower(), is_initials))
+    return tokens
+
+
+def normalize_name(name):
+    """Canonical player name key: case, accents, punctuation and whitespace folded, initials joined
+
+    "M.S. Dhoni", "M S  Dhoni" and "MS Dhoni" all become "ms dhoni".
+    """
+    words = []
+    pending_initials = ""
+    for token, is_initials in _tokens(name):
+        if is_initials:
+            pending_initials += token
+            continue
+        if pending_initials:
+            words.append(pending_initials)
+            pending_initials = ""
+        words.append(token)
+    if pending_initials:
+        words.append(pending_initials)
+    return " ".join(words)
+
+
+def initials_key(name):
+    """Initials of the given names plus the surname ("Virat Kohli" and "V Kohli" -> "v kohli")"""
+    tokens = _tokens(name)
+    if len(tokens) < 2:
+        return normalize_name(name)
+    *given, (surname, _) = tokens
+    initials = "".join(token if is_initials else token[0] for token, is_initials in given)
+    return f"{initials} {surname}"
+
+
+def uses_initials(name):
+    """True when any given name is written as initials"""
+    tokens = _tokens(name)
+    return any(is_initials for _, is_initials in tokens[:-1])
+
+
+class PlayerResolver:
+    """Resolve scraped player names to one players row per identity
+
+    Names are matched on the normalized key first. A name that only differs by
+    abbreviated given names ("V Kohli" vs "Virat Kohli") is merged when exactly one
+    existing player shares its initials key. Every merge is recorded in
+    `player_aliases` and kept in `merged` for the load report.
+    """
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.by_key = {}
+        self.by_initials = {}
+        self.names = {}
+        self.merged = []
+
+    def load(self):
+        """Cache existing players and recorded aliases by key, backfilling keys missing from old rows"""
+        self.by_key, self.by_initials, self.names = {}, {}, {}
+        self.cursor.execute("SELECT player_id, full_name, name_key FROM players ORDER BY player_id")
+        for player_id, full_name, name_key in self.cursor.fetchall():
+            if name_key is None:
+                name_key = normalize_name(full_name)
+                self.cursor.execute(
+                    "UPDATE players SET name_key = %s, initials_key = %s WHERE player_id = %s",
+                    (name_key, initials_key(full_name), player_id)
+                )
+            self._remember(player_id, full_name, name_key)
+        # Recorded aliases resolve to their player on later loads, even once the initials
+        # key has become ambiguous ("V Kohli" after "Varun Kohli" arrived)
+        self.cursor.execute("SELECT alias_name, player_id FROM player_aliases ORDER BY alias_name")
+        for alias_name, player_id in self.cursor.fetchall():
+            self.by_key.setdefault(normalize_name(alias_name), player_id)
+        return self
+
+    def _remember(self, player_id, full_name, name_key):
+        self.by_key.setdefault(name_key, player_id)
+        self.by_initials.setdefault(initials_key(full_name), set()).add(player_id)
+        self.names[player_id] = full_name
+
+    def _record_alias(self, alias, player_id, matched_by):
+        """Persist an alias and add it to the merge report"""
+        self.cursor.execute("""
+            INSERT INTO player_aliases (alias_name, alias_key, player_id, matched_by)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (alias_name) DO NOTHING
+        """, (alias, normalize_name(alias), player_id, matched_by))
+        if self.cursor.rowcount:
+            self.merged.append((alias, self.names[player_id], matched_by))
+
+    def resolve(self, player_name):
+        """Return the player_id for a scraped name, inserting a new player if needed"""
+        player_name = str(player_name).strip()
+        if not player_name or player_name == 'nan' or player_name == '0':
+            return None
+
+        name_key = normalize_name(player_name)
+        player_id = self.by_key.get(name_key)
+        if player_id is not None:
+            if self.names[player_id] != player_name:
+                self._record_alias(player_name, player_id, 'normalized')
+            return player_id
+
+        candidates = self.by_initials.get(initials_key(player_name), set())
+        if len(candidates) == 1:
+            candidate = next(iter(candidates))
+            if uses_initials(player_name) or uses_initials(self.names[candidate]):
+                self.by_key[name_key] = candidate
+                self._record_alias(player_name, candidate, 'initials')
+                return candidate
+
+        self.cursor.execute(
+            "INSERT INTO players (full_name, name_key, initials_key) VALUES (%s, %s, %s) RETURNING player_id",
+            (player_name, name_key, initials_key(player_name))
+        )
+        result = self.cursor.fetchone()
+        player_id = result[0] if result else None
+        if player_id is not None:
+            self._remember(player_id, player_name, name_key)
+        return player_id
+
+    def print_merge_report(self):
+        """Print the aliases merged into existing players during this load"""
+        print("\n🪪 MERGED PLAYER IDENTITIES:")
+        if not self.merged:
+            print("   No aliases merged")
+            return
+        for alias, canonical, matched_by in self.merged:
+            print(f"   - '{alias}' → '{canonical}' ({matched_by})")
+
+
+def backfill_alias_keys(cursor):
+    """Fill player_aliases.alias_key for aliases recorded before the column existed"""
+    cursor.execute("SELECT alias_name FROM player_aliases WHERE alias_key IS NULL")
+    for (alias_name,) in cursor.fetchall():
+        cursor.execute(
+            "UPDATE player_aliases SET alias_key = %s WHERE alias_name = %s",
+            (normalize_name(alias_name), alias_name)
+        )
+
+
+def merge_duplicate_players(cursor):
+    """Fold existing players that share a name key into the lowest player_id
+
+    Stats rows move to the surviving player unless it already has that format;
+    the duplicate's name is kept as an alias. Returns the list of merges.
+    """
+    cursor.execute("SELECT player_id, full_name FROM players ORDER BY player_id")
+    groups = {}
+    for player_id, full_name in cursor.fetchall():
+        groups.setdefault(normalize_name(full_name), []).append((player_id, full_name))
+
+    merges = []
+    for name_key, members in groups.items():
+        (keep_id, keep_name), duplicates = members[0], members[1:]
+        for duplicate_id, duplicate_name in duplicates:
+            for table in ("batting_stats", "bowling_stats"):
+                cursor.execute(f"""
+                    UPDATE {table} SET player_id = %s
+                    WHERE player_id = %s
+                    AND format_id NOT IN (SELECT format_id FROM {table} WHERE player_id = %s)
+                """, (keep_id, duplicate_id, keep_id))
+            cursor.execute("""
+                INSERT INTO player_aliases (alias_name, alias_key, player_id, matched_by)
+                VALUES (%s, %s, %s, 'normalized')
+                ON CONFLICT (alias_name) DO NOTHING
+            """, (duplicate_name, name_key, keep_id))
+            cursor.execute("DELETE FROM players WHERE player_id = %s", (duplicate_id,))
+            merges.append((duplicate_name, keep_name, 'normalized'))
+        cursor.execute(
+            "UPDATE players SET name_key = %s, initials_key = %s WHERE player_id = %s",
+            (name_key, initials_key(keep_name), keep_id)
+        )
+    return merges
@@ -0,0 +1,153 @@
+import argparse
+import json
+
+from dotenv import load_dotenv
+
+import db
+from player_identity import normalize_name
+
+load_dotenv()
+
+# Profile sections: stats table, alias and the columns copied into each format's entry
+PROFILE_SECTIONS = {
+    'batting': ('batting_stats', 'bs', [
+        'rank', 'matches', 'innings', 'runs', 'average', 'strike_rate', 'highest_score',
+        'fours', 'sixes', 'fifties', 'hundreds', 'runs_per_innings', 'boundary_percentage',
+    ]),
+    'bowling': ('bowling_stats', 'bws', [
+        'rank', 'matches', 'innings', 'wickets', 'average', 'economy', 'strike_rate',
+        'bowling_figure', 'runs', 'wickets_per_match',
+    ]),
+}
+
+UPSERT_PROFILE_SQL = """
+    INSERT INTO player_profiles (player_id, profile, updated_at)
+    VALUES (%s, %s, CURRENT_TIMESTAMP)
+    ON CONFLICT (player_id) DO UPDATE SET
+    profile = EXCLUDED.profile,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+def _chunks(player_ids):
+    """None (every player) or sorted id chunks, with the matching WHERE clause"""
+    if player_ids is None:
+        yield "", None
+        return
+    ids = sorted(player_ids)
+    for start in range(0, len(ids), db.ID_CHUNK):
+        chunk = ids[start:start + db.ID_CHUNK]
+        yield f"WHERE p.player_id IN ({', '.join(['%s'] * len(chunk))})", tuple(chunk)
+
+
+def build_profiles(cursor, player_ids=None):
+    """Profile documents for the given players (all players when None), keyed by player_id"""
+    profiles = {}
+    for where, params in _chunks(player_ids):
+        cursor.execute(f"SELECT p.player_id, p.full_name FROM players p {where}", params)
+        for player_id, full_name in cursor.fetchall():
+            profiles[player_id] = {
+                'player_id': player_id, 'full_name': full_name, 'aliases': [],
+                'batting': {}, 'bowling': {},
+            }
+
+        cursor.execute(f"""
+            SELECT a.player_id, a.alias_name
+            FROM player_aliases a
+            JOIN players p ON p.player_id = a.player_id
+            {where}
+            ORDER BY a.alias_name
+        """, params)
+        for player_id, alias_name in cursor.fetchall():
+            profiles[player_id]['aliases'].append(alias_name)
+
+        for section, (table, alias, columns) in PROFILE_SECTIONS.items():
+            cursor.execute(f"""
+                SELECT p.player_id, f.format_name, {', '.join(f'{alias}.{c}' for c in columns)}
+                FROM {table} {alias}
+                JOIN players p ON p.player_id = {alias}.player_id
+                JOIN formats f ON f.format_id = {alias}.format_id
+                {where}
+            """, params)
+            for player_id, format_name, *values in cursor.fetchall():
+                profiles[player_id][section][format_name] = {
+                    column: db.plain_value(value) for column, value in zip(columns, values)
+                }
+    return profiles
+
+
+def rebuild_profiles(cursor, player_ids=None):
+    """Rewrite the stored profiles of the given players (all when None); returns the count
+
+    Runs in the caller's transaction, so a load and its profiles commit together.
+    """
+    if player_ids is not None and not player_ids:
+        return 0
+    profiles = build_profiles(cursor, player_ids)
+    db.bulk_execute(cursor, UPSERT_PROFILE_SQL, [
+        (player_id, json.dumps(profile)) for player_id, profile in profiles.items()
+    ])
+    return len(profiles)
+
+
+def _decode(profile):
+    # psycopg2 decodes JSONB itself; SQLite stores the document as text
+    return json.loads(profile) if isinstance(profile, str) else profile
+
+
+def get_profile(cursor, player_id):
+    """A player's profile document by canonical id (one primary-key lookup), or None"""
+    cursor.execute("SELECT profile FROM player_profiles WHERE player_id = %s", (player_id,))
+    row = cursor.fetchone()
+    return _decode(row[0]) if row else None
+
+
+def get_profile_by_name(cursor, name):
+    """A player's profile document by any spelling of their name, or None
+
+    The unique name key is tried first, then the normalized keys of recorded aliases
+    ("V Kohli" for Virat Kohli).
+    """
+    name_key = normalize_name(name)
+    cursor.execute("""
+        SELECT pp.profile
+        FROM players p
+        JOIN player_profiles pp ON pp.player_id = p.player_id
+        WHERE p.name_key = %s
+    """, (name_key,))
+    row = cursor.fetchone()
+    if row is None:
+        cursor.execute("""
+            SELECT pp.profile
+            FROM player_aliases a
+            JOIN player_profiles pp ON pp.player_id = a.player_id
+            WHERE a.alias_key = %s
+            ORDER BY a.alias_name
+        """, (name_key,))
+        row = cursor.fetchone()
+    return _decode(row[0]) if row else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or rebuild denormalized player profiles")
+    parser.add_argument('names', nargs='*', help="players to show")
+    parser.add_argument('--rebuild', action='store_true', help="rebuild every profile first")
+    args = parser.parse_args()
+
+    conn = db.connect()
+    cursor = conn.cursor()
+    try:
+        if args.rebuild:
+            count = rebuild_profiles(cursor)
+            conn.commit()
+            print(f"✅ Rebuilt {count} player profiles")
+        for name in args.names:
+            profile = get_profile_by_name(cursor, name)
+            print(json.dumps(profile, indent=2) if profile else f"❌ No profile for {name}")
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,200 +1,320 @@
-import psycopg2
-import pandas as pd
-import os
 from dotenv import load_dotenv
 
+import db
+from query_profiler import QueryProfiler
+from rank_gaps import fetch_pair_comparisons, fetch_rank_gaps
+
 # Load environment variables
 load_dotenv()
 
-# ✅ Connect to YOUR actual Neon DB from .env file
-conn = psycopg2.connect(os.getenv('DATABASE_URL'))
-cur = conn.cursor()
-
-print("🏏 CRICKET STATISTICS ANALYSIS - FINAL RESULTS")
-print("=" * 60)
-
-# 🔎 1. Search Functionality
-print("\n1. PLAYERS WHOSE NAMES START WITH 'V'")
-print("-" * 40)
-cur.execute("SELECT DISTINCT full_name FROM players WHERE full_name LIKE 'V%' ORDER BY full_name;")
-players_v = cur.fetchall()
-for player in players_v:
-    print(f"  • {player[0]}")
-
-print("\n2. SEARCH PLAYER - Virat Kohli")
-print("-" * 40)
-cur.execute("""
-    SELECT DISTINCT p.full_name, f.format_name, bs.runs, bs.matches
+# SQL for each analysis question (kept as constants so other tools can reuse them).
+# Names sort with COLLATE "C" (code-point order, BINARY on SQLite) so the order doesn't depend
+# on the server locale and matches the in-memory engine. Top-N queries break ties by
+# batting_id / bowling_id, the order the engine loads rows in.
+PLAYERS_BY_PREFIX_SQL = """
+    SELECT DISTINCT full_name COLLATE "C" AS full_name
+    FROM players
+    WHERE full_name LIKE %s
+    ORDER BY full_name;
+"""
+
+PLAYER_BATTING_SQL = """
+    SELECT DISTINCT p.full_name COLLATE "C" AS full_name, f.format_name COLLATE "C" AS format_name,
+           bs.runs, bs.matches
     FROM players p
     JOIN batting_stats bs ON p.player_id = bs.player_id
     JOIN formats f ON bs.format_id = f.format_id
-    WHERE p.full_name LIKE '%Virat%' OR p.full_name LIKE '%Kohli%'
-    ORDER BY f.format_name;
-""")
-virat_data = cur.fetchall()
-for row in virat_data:
-    print(f"  • {row[1]}: {row[2]} runs, {row[3]} matches")
-
-# 📊 2. Match Records
-print("\n3. PLAYER WITH HIGHEST NUMBER OF MATCHES")
-print("-" * 40)
-cur.execute("""
-    SELECT p.full_name, bs.matches 
+    WHERE p.full_name LIKE %s OR p.full_name LIKE %s
+    ORDER BY format_name, full_name;
+"""
+
+MOST_MATCHES_SQL = """
+    SELECT p.full_name, bs.matches
     FROM batting_stats bs
     JOIN players p ON p.player_id = bs.player_id
-    ORDER BY bs.matches DESC
+    ORDER BY bs.matches DESC, bs.batting_id
     LIMIT 1;
-""")
-highest = cur.fetchone()
-print(f"  • {highest[0]} - {highest[1]} matches")
-
-print("\n4. PLAYER WITH LOWEST NUMBER OF MATCHES (at least 1)")
-print("-" * 40)
-cur.execute("""
-    SELECT p.full_name, bs.matches 
+"""
+
+FEWEST_MATCHES_SQL = """
+    SELECT p.full_name, bs.matches
     FROM batting_stats bs
     JOIN players p ON p.player_id = bs.player_id
     WHERE bs.matches > 0
-    ORDER BY bs.matches ASC
+    ORDER BY bs.matches ASC, bs.batting_id
     LIMIT 1;
-""")
-lowest = cur.fetchone()
-print(f"  • {lowest[0]} - {lowest[1]} match")
-
-# 🏏 3. Performance Insights
-print("\n5. TOP 5 BEST BATSMEN (BY RUNS)")
-print("-" * 40)
-cur.execute("""
-    SELECT DISTINCT p.full_name, bs.runs, bs.matches, f.format_name
+"""
+
+TOP_BATSMEN_SQL = """
+    SELECT p.full_name, bs.runs, bs.matches, f.format_name
     FROM batting_stats bs
     JOIN players p ON p.player_id = bs.player_id
     JOIN formats f ON bs.format_id = f.format_id
-    ORDER BY bs.runs DESC
-    LIMIT 5;
-""")
-top_batsmen = cur.fetchall()
-for i, batsman in enumerate(top_batsmen, 1):
-    print(f"  {i}. {batsman[0]} - {batsman[1]} runs ({batsman[3]})")
-
-print("\n6. TOP 5 BOWLERS (BY MATCHES - ACTUAL BOWLERS)")
-print("-" * 40)
-cur.execute("""
-    SELECT DISTINCT p.full_name, bws.matches, f.format_name
+    ORDER BY bs.runs DESC, bs.batting_id
+    LIMIT %s;
+"""
+
+TOP_BOWLERS_SQL = """
+    SELECT p.full_name, bws.matches, f.format_name
     FROM bowling_stats bws
     JOIN players p ON p.player_id = bws.player_id
     JOIN formats f ON bws.format_id = f.format_id
     WHERE bws.matches > 0
-    ORDER BY bws.matches DESC
-    LIMIT 5;
-""")
-top_bowlers = cur.fetchall()
-for i, bowler in enumerate(top_bowlers, 1):
-    print(f"  {i}. {bowler[0]} - {bowler[1]} matches ({bowler[2]})")
-
-print("\n7. MOST AGGRESSIVE BATSMAN (HIGHEST STRIKE RATE)")
-print("-" * 40)
-try:
-    cur.execute("""
-        SELECT DISTINCT p.full_name, bs.strike_rate, bs.runs, bs.matches, f.format_name
-        FROM batting_stats bs
-        JOIN players p ON p.player_id = bs.player_id
-        JOIN formats f ON bs.format_id = f.format_id
-        WHERE bs.matches >= 10 AND bs.strike_rate IS NOT NULL AND bs.strike_rate > 0
-        ORDER BY bs.strike_rate DESC
-        LIMIT 1;
-    """)
-    aggressive = cur.fetchone()
-    if aggressive:
-        print(f"  • {aggressive[0]} - Strike Rate: {aggressive[1]}")
-        print(f"    {aggressive[3]} matches, {aggressive[2]} runs ({aggressive[4]})")
-    else:
-        # Fallback: show batsman with most runs if strike rate not available
-        cur.execute("""
-            SELECT DISTINCT p.full_name, bs.runs, bs.matches, f.format_name
-            FROM batting_stats bs
-            JOIN players p ON p.player_id = bs.player_id
-            JOIN formats f ON bs.format_id = f.format_id
-            WHERE bs.runs > 0
-            ORDER BY bs.runs DESC
-            LIMIT 1;
-        """)
-        aggressive = cur.fetchone()
-        print(f"  • {aggressive[0]} - {aggressive[1]} runs ({aggressive[3]})")
-        print("    (Strike rate data not available)")
-except Exception as e:
-    print(f"  • Error fetching strike rate data: {e}")
-
-print("\n8. ALL-ROUNDERS (Players with both batting and bowling records)")
-print("-" * 40)
-cur.execute("""
-    SELECT DISTINCT p.full_name
+    ORDER BY bws.matches DESC, bws.bowling_id
+    LIMIT %s;
+"""
+
+AGGRESSIVE_BATSMAN_SQL = """
+    SELECT p.full_name, bs.strike_rate, bs.runs, bs.matches, f.format_name
+    FROM batting_stats bs
+    JOIN players p ON p.player_id = bs.player_id
+    JOIN formats f ON bs.format_id = f.format_id
+    WHERE bs.matches >= %s AND bs.strike_rate IS NOT NULL AND bs.strike_rate > 0
+    ORDER BY bs.strike_rate DESC, bs.batting_id
+    LIMIT 1;
+"""
+
+TOP_SCORER_FALLBACK_SQL = """
+    SELECT p.full_name, bs.runs, bs.matches, f.format_name
+    FROM batting_stats bs
+    JOIN players p ON p.player_id = bs.player_id
+    JOIN formats f ON bs.format_id = f.format_id
+    WHERE bs.runs > 0
+    ORDER BY bs.runs DESC, bs.batting_id
+    LIMIT 1;
+"""
+
+ALL_ROUNDERS_SQL = """
+    SELECT DISTINCT p.full_name COLLATE "C" AS full_name
     FROM players p
     JOIN batting_stats bs ON p.player_id = bs.player_id
     JOIN bowling_stats bws ON p.player_id = bws.player_id
     WHERE p.full_name != '' AND p.full_name IS NOT NULL
-    ORDER BY p.full_name
-    LIMIT 15;
-""")
-all_rounders = cur.fetchall()
-if all_rounders:
-    print("  Players with both batting and bowling records:")
-    for player in all_rounders:
-        if player[0] and player[0] != '-':  # Filter out empty names
-            print(f"  • {player[0]}")
-else:
-    print("  • No players found with both batting and bowling records")
-
-# ⚔️ 4. Custom Player Comparisons
-print("\n9. ROHIT vs VIRAT - MATCHES COMPARISON")
-print("-" * 40)
-cur.execute("""
-    SELECT 
-        (SELECT bs.matches FROM batting_stats bs JOIN players p ON p.player_id = bs.player_id 
-         WHERE (p.full_name LIKE '%Rohit%' OR p.full_name LIKE '%Sharma%') AND bs.format_id = 2 LIMIT 1) as rohit_odi,
-        (SELECT bs.matches FROM batting_stats bs JOIN players p ON p.player_id = bs.player_id 
-         WHERE (p.full_name LIKE '%Virat%' OR p.full_name LIKE '%Kohli%') AND bs.format_id = 2 LIMIT 1) as virat_odi,
-        (SELECT bs.matches FROM batting_stats bs JOIN players p ON p.player_id = bs.player_id 
-         WHERE (p.full_name LIKE '%Virat%' OR p.full_name LIKE '%Kohli%') AND bs.format_id = 2 LIMIT 1) - 
-        (SELECT bs.matches FROM batting_stats bs JOIN players p ON p.player_id = bs.player_id 
-         WHERE (p.full_name LIKE '%Rohit%' OR p.full_name LIKE '%Sharma%') AND bs.format_id = 2 LIMIT 1) as matches_needed;
-""")
-comparison = cur.fetchone()
-if comparison[0] and comparison[1]:
-    print(f"  • Rohit Sharma: {comparison[0]} ODI matches")
-    print(f"  • Virat Kohli: {comparison[1]} ODI matches") 
-    print(f"  • Rohit needs {comparison[2]} more matches to surpass Virat")
-else:
-    print("  • Could not find match data for Rohit or Virat")
-
-print("\n10. HARBHAJAN SINGH - MATCHES TO REACH 5TH POSITION")
-print("-" * 40)
-cur.execute("""
-    WITH top_players AS (
-        SELECT DISTINCT p.full_name, bs.matches
-        FROM batting_stats bs
-        JOIN players p ON p.player_id = bs.player_id
-        ORDER BY bs.matches DESC
-        LIMIT 5
+    ORDER BY full_name
+    LIMIT %s;
+"""
+
+# Per-format leaderboards: metrics backed by a (format_id, metric DESC) index, by table
+LEADERBOARD_METRICS = {
+    'batting_stats': ('runs', 'matches', 'strike_rate', 'runs_per_innings'),
+    'bowling_stats': ('matches', 'wickets', 'wickets_per_match'),
+}
+
+# PostgreSQL: one LIMIT k index scan per format via LATERAL
+TOP_K_PER_FORMAT_SQL = """
+    SELECT f.format_name, p.full_name, t.value
+    FROM formats f
+    CROSS JOIN LATERAL (
+        SELECT s.player_id, s.{metric} AS value
+        FROM {table} s
+        WHERE s.format_id = f.format_id AND s.{metric} IS NOT NULL
+        ORDER BY s.{metric} DESC, s.player_id
+        LIMIT %s
+    ) t
+    JOIN players p ON p.player_id = t.player_id
+    ORDER BY f.format_name, t.value DESC, p.player_id;
+"""
+
+# SQLite has no LATERAL; number the rows of each format in index order instead
+TOP_K_PER_FORMAT_WINDOW_SQL = """
+    SELECT f.format_name, p.full_name, t.value
+    FROM (
+        SELECT s.format_id, s.player_id, s.{metric} AS value,
+               ROW_NUMBER() OVER (PARTITION BY s.format_id ORDER BY s.{metric} DESC, s.player_id) AS position
+        FROM {table} s
+        WHERE s.{metric} IS NOT NULL
+    ) t
+    JOIN formats f ON f.format_id = t.format_id
+    JOIN players p ON p.player_id = t.player_id
+    WHERE t.position <= %s
+    ORDER BY f.format_name, t.value DESC, p.player_id;
+"""
+
+
+def search_players_by_prefix(cur, prefix):
+    """Names of players starting with the given prefix"""
+    cur.execute(PLAYERS_BY_PREFIX_SQL, (f"{prefix}%",))
+    return cur.fetchall()
+
+
+def search_player_batting(cur, first_name, last_name):
+    """Batting runs and matches per format for a player matched by first or last name"""
+    cur.execute(PLAYER_BATTING_SQL, (f"%{first_name}%", f"%{last_name}%"))
+    return cur.fetchall()
+
+
+def player_with_most_matches(cur):
+    """Batting record with the highest number of matches"""
+    cur.execute(MOST_MATCHES_SQL)
+    return cur.fetchone()
+
+
+def player_with_fewest_matches(cur):
+    """Batting record with the lowest number of matches (at least 1)"""
+    cur.execute(FEWEST_MATCHES_SQL)
+    return cur.fetchone()
+
+
+def top_batsmen_by_runs(cur, limit=5):
+    """Top batting records by runs across formats"""
+    cur.execute(TOP_BATSMEN_SQL, (limit,))
+    return cur.fetchall()
+
+
+def top_bowlers_by_matches(cur, limit=5):
+    """Top bowling records by matches across formats"""
+    cur.execute(TOP_BOWLERS_SQL, (limit,))
+    return cur.fetchall()
+
+
+def most_aggressive_batsman(cur, min_matches=10):
+    """Batting record with the highest strike rate, or None if strike rates are missing"""
+    cur.execute(AGGRESSIVE_BATSMAN_SQL, (min_matches,))
+    return cur.fetchone()
+
+
+def top_scorer_fallback(cur):
+    """Batting record with the most runs (used when strike rates are missing)"""
+    cur.execute(TOP_SCORER_FALLBACK_SQL)
+    return cur.fetchone()
+
+
+def all_rounders(cur, limit=15):
+    """Players with both batting and bowling records"""
+    cur.execute(ALL_ROUNDERS_SQL, (limit,))
+    return cur.fetchall()
+
+
+def top_k_per_format(cur, metric, k=5, table='batting_stats'):
+    """(format, player, value) rows: the k highest values of a metric in every format"""
+    if metric not in LEADERBOARD_METRICS.get(table, ()):
+        raise ValueError(f"No leaderboard for {table}.{metric}")
+    if k < 1:
+        raise ValueError(f"k must be at least 1 (got {k})")
+    sql = TOP_K_PER_FORMAT_WINDOW_SQL if db.dialect(cur) == 'sqlite' else TOP_K_PER_FORMAT_SQL
+    cur.execute(sql.format(metric=metric, table=table), (k,))
+    return cur.fetchall()
+
+
+def main():
+    # ✅ Connect to YOUR actual Neon DB from .env file (or DB_BACKEND=sqlite)
+    conn = db.connect()
+    cur = conn.cursor()
+    profiler = QueryProfiler()
+
+    print("🏏 CRICKET STATISTICS ANALYSIS - FINAL RESULTS")
+    print("=" * 60)
+
+    # 🔎 1. Search Functionality
+    print("\n1. PLAYERS WHOSE NAMES START WITH 'V'")
+    print("-" * 40)
+    players_v = profiler.run("1. prefix search", search_players_by_prefix, cur, 'V')
+    for player in players_v:
+        print(f"  • {player[0]}")
+
+    print("\n2. SEARCH PLAYER - Virat Kohli")
+    print("-" * 40)
+    virat_data = profiler.run("2. player search", search_player_batting, cur, 'Virat', 'Kohli')
+    for row in virat_data:
+        print(f"  • {row[1]}: {row[2]} runs, {row[3]} matches")
+
+    # 📊 2. Match Records
+    print("\n3. PLAYER WITH HIGHEST NUMBER OF MATCHES")
+    print("-" * 40)
+    highest = profiler.run("3. most matches", player_with_most_matches, cur)
+    print(f"  • {highest[0]} - {highest[1]} matches")
+
+    print("\n4. PLAYER WITH LOWEST NUMBER OF MATCHES (at least 1)")
+    print("-" * 40)
+    lowest = profiler.run("4. fewest matches", player_with_fewest_matches, cur)
+    print(f"  • {lowest[0]} - {lowest[1]} match")
+
+    # 🏏 3. Performance Insights
+    print("\n5. TOP 5 BEST BATSMEN (BY RUNS)")
+    print("-" * 40)
+    top_batsmen = profiler.run("5. top batsmen", top_batsmen_by_runs, cur, 5)
+    for i, batsman in enumerate(top_batsmen, 1):
+        print(f"  {i}. {batsman[0]} - {batsman[1]} runs ({batsman[3]})")
+
+    print("\n6. TOP 5 BOWLERS (BY MATCHES - ACTUAL BOWLERS)")
+    print("-" * 40)
+    top_bowlers = profiler.run("6. top bowlers", top_bowlers_by_matches, cur, 5)
+    for i, bowler in enumerate(top_bowlers, 1):
+        print(f"  {i}. {bowler[0]} - {bowler[1]} matches ({bowler[2]})")
+
+    print("\n7. MOST AGGRESSIVE BATSMAN (HIGHEST STRIKE RATE)")
+    print("-" * 40)
+    try:
+        aggressive = profiler.run("7. aggressive batsman", most_aggressive_batsman, cur, 10)
+        if aggressive:
+            print(f"  • {aggressive[0]} - Strike Rate: {aggressive[1]}")
+            print(f"    {aggressive[3]} matches, {aggressive[2]} runs ({aggressive[4]})")
+        else:
+            # Fallback: show batsman with most runs if strike rate not available
+            aggressive = profiler.run(
+                "7. aggressive batsman (fallback)", top_scorer_fallback, cur,
+                note="no strike rates, fell back to top scorer"
+            )
+            print(f"  • {aggressive[0]} - {aggressive[1]} runs ({aggressive[3]})")
+            print("    (Strike rate data not available)")
+    except Exception as e:
+        print(f"  • Error fetching strike rate data: {e}")
+
+    print("\n8. ALL-ROUNDERS (Players with both batting and bowling records)")
+    print("-" * 40)
+    all_rounder_rows = profiler.run("8. all-rounders", all_rounders, cur, 15)
+    if all_rounder_rows:
+        print("  Players with both batting and bowling records:")
+        for player in all_rounder_rows:
+            if player[0] and player[0] != '-':  # Filter out empty names
+                print(f"  • {player[0]}")
+    else:
+        print("  • No players found with both batting and bowling records")
+
+    # ⚔️ 4. Custom Player Comparisons
+    print("\n9. ROHIT vs VIRAT - MATCHES COMPARISON")
+    print("-" * 40)
+    comparison = profiler.run(
+        "9. pair comparison", fetch_pair_comparisons, cur,
+        [("Rohit Sharma", "Virat Kohli")], ["matches"], ["ODI"]
     )
-    SELECT 
-        (SELECT matches FROM top_players ORDER BY matches ASC LIMIT 1) as fifth_position,
-        (SELECT bs.matches FROM batting_stats bs JOIN players p ON p.player_id = bs.player_id 
-         WHERE p.full_name LIKE '%Harbhajan%' LIMIT 1) as harbhajan_current,
-        (SELECT matches FROM top_players ORDER BY matches ASC LIMIT 1) - 
-        (SELECT bs.matches FROM batting_stats bs JOIN players p ON p.player_id = bs.player_id 
-         WHERE p.full_name LIKE '%Harbhajan%' LIMIT 1) as matches_needed;
-""")
-harbhajan_data = cur.fetchone()
-if harbhajan_data[0] and harbhajan_data[1]:
-    print(f"  • 5th position: {harbhajan_data[0]} matches")
-    print(f"  • Harbhajan Singh: {harbhajan_data[1]} matches")
-    print(f"  • Matches needed: {harbhajan_data[2]}")
-else:
-    print("  • Could not find match data for Harbhajan Singh")
-
-print("\n" + "=" * 60)
-print("📊 ANALYSIS COMPLETE!")
-print("=" * 60)
-
-cur.close()
-conn.close()
\ No newline at end of file
+    if comparison:
+        row = comparison[0]
+        print(f"  • {row.player_a}: {row.value_a} ODI matches")
+        print(f"  • {row.player_b}: {row.value_b} ODI matches")
+        print(f"  • Rohit needs {row.gap} more matches to surpass Virat")
+    else:
+        print("  • Could not find match data for Rohit or Virat")
+
+    print("\n10. HARBHAJAN SINGH - MATCHES TO REACH 5TH POSITION")
+    print("-" * 40)
+    harbhajan_data = profiler.run("10. rank gaps", fetch_rank_gaps, cur, ["Harbhajan Singh"], ["matches"], [5])
+    if harbhajan_data:
+        for row in harbhajan_data:
+            print(f"  • {row.format_name} 5th position: {row.target_value} matches")
+            print(f"  • Harbhajan Singh: {row.value} matches (rank {row.current_rank})")
+            print(f"  • Matches needed: {max(row.gap or 0, 0)}")
+    else:
+        print("  • Could not find match data for Harbhajan Singh")
+
+    print("\n11. TOP 3 RUNS PER INNINGS IN EVERY FORMAT")
+    print("-" * 40)
+    leaders = profiler.run("11. runs per innings leaders", top_k_per_format, cur, 'runs_per_innings', 3)
+    for format_name, player, value in leaders:
+        print(f"  • {format_name}: {player} - {value} runs per innings")
+    if not leaders:
+        print("  • No batting records found")
+
+    print("\n" + "=" * 60)
+    print("📊 ANALYSIS COMPLETE!")
+    print("=" * 60)
+
+    profiler.print_summary()
+    profiler.write_summary()
+
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import db
+
+# Queries slower than this (ms) get their plan captured and go to the slow-query log
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '200'))
+SLOW_QUERY_LOG = os.getenv('SLOW_QUERY_LOG', 'logs/slow_queries.jsonl')
+QUERY_RUNS_LOG = os.getenv('QUERY_RUNS_LOG', 'logs/query_runs.jsonl')
+
+
+class _RecordingCursor:
+    """Cursor proxy that remembers every statement executed through it"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+        return self._cursor.execute(sql, params) if params is not None else self._cursor.execute(sql)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _row_count(result):
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    return 1
+
+
+def _cache_status(plan):
+    """Buffer-cache status from an EXPLAIN (BUFFERS) plan: hit, partial or miss"""
+    if not isinstance(plan, list) or not plan or 'Plan' not in plan[0]:
+        return 'not sampled'
+    top = plan[0]['Plan']
+    hit, read = top.get('Shared Hit Blocks', 0), top.get('Shared Read Blocks', 0)
+    if not read:
+        return 'hit'
+    return 'partial' if hit else 'miss'
+
+
+def explain(cursor, sql, params=None):
+    """Execution plan for a read-only statement: EXPLAIN (ANALYZE, BUFFERS) on PostgreSQL,
+    EXPLAIN QUERY PLAN on SQLite"""
+    if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return None
+    if db.dialect(cursor) == 'sqlite':
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+    cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", params)
+    plan = cursor.fetchone()[0]
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+class QueryProfiler:
+    """Times analytical queries, captures plans for slow ones and keeps a per-run summary
+
+    Every call made through `run` records wall time, rows returned and cache status.
+    Calls slower than `threshold_ms` are re-run under EXPLAIN (ANALYZE, BUFFERS) (read-only
+    statements only) and appended to the slow-query log as JSON lines.
+    """
+
+    def __init__(self, threshold_ms=SLOW_QUERY_MS, slow_log=SLOW_QUERY_LOG, runs_log=QUERY_RUNS_LOG):
+        self.threshold_ms = threshold_ms
+        self.slow_log = slow_log
+        self.runs_log = runs_log
+        self.records = []
+        self.started_at = datetime.now(timezone.utc)
+
+    def run(self, label, func, cursor, *args, note=None):
+        """Call func(cursor, *args), record its timing and return its result"""
+        recording = _RecordingCursor(cursor)
+        start = time.perf_counter()
+        result = func(recording, *args)
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        record = {
+            'label': label,
+            'wall_ms': round(wall_ms, 3),
+            'rows': _row_count(result),
+            'statements': len(recording.statements),
+            'cache': 'not sampled',
+            'slow': wall_ms >= self.threshold_ms,
+        }
+        if note:
+            record['note'] = note
+        if record['slow']:
+            self._log_slow(record, cursor, recording.statements)
+        self.records.append(record)
+        return result
+
+    def _log_slow(self, record, cursor, statements):
+        """Capture plans for a slow call and append it to the slow-query log"""
+        plans = []
+        for sql, params in statements:
+            try:
+                plan = explain(cursor, sql, params)
+            except Exception as e:
+                plan = f"EXPLAIN failed: {e}"
+                if db.dialect(cursor) == 'postgres':
+                    cursor.connection.rollback()
+            plans.append({'sql': ' '.join(sql.split()), 'params': params, 'plan': plan})
+        if plans:
+            record['cache'] = _cache_status(plans[-1]['plan'])
+
+        entry = dict(record, timestamp=datetime.now(timezone.utc).isoformat(timespec='seconds'), plans=plans)
+        self._append(self.slow_log, entry)
+
+    def _append(self, path, entry):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, default=str) + '\n')
+
+    def summary(self):
+        """Per-run totals plus every recorded call"""
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'queries': len(self.records),
+            'total_ms': round(sum(r['wall_ms'] for r in self.records), 3),
+            'slow_queries': sum(1 for r in self.records if r['slow']),
+            'threshold_ms': self.threshold_ms,
+            'records': self.records,
+        }
+
+    def write_summary(self):
+        """Append this run's summary to the runs log"""
+        self._append(self.runs_log, self.summary())
+
+    def print_summary(self):
+        """Print a latency table for this run"""
+        summary = self.summary()
+        print("\n⏱️  QUERY PROFILE")
+        print("-" * 60)
+        for record in self.records:
+            flag = "🐢" if record['slow'] else "  "
+            note = f"  ({record['note']})" if 'note' in record else ""
+            print(f" {flag} {record['label']:<34}{record['wall_ms']:>9.1f} ms {record['rows']:>5} rows{note}")
+        print("-" * 60)
+        print(f"   {summary['queries']} queries, {summary['total_ms']:.1f} ms total, "
+              f"{summary['slow_queries']} over {self.threshold_ms:.0f} ms")
+        if summary['slow_queries']:
+            print(f"   Slow-query plans written to {self.slow_log}")
@@ -0,0 +1,145 @@
+from collections import namedtuple
+
+from player_identity import PLAYER_KEYS_CTE, normalize_name
+
+# Metric name -> (stats table, column); every metric is ranked per format, highest first
+METRIC_SOURCES = {
+    'matches': ('batting_stats', 'matches'),
+    'runs': ('batting_stats', 'runs'),
+    'wickets': ('bowling_stats', 'wickets'),
+}
+
+RankGap = namedtuple(
+    'RankGap',
+    ['full_name', 'format_name', 'metric', 'value', 'current_rank', 'target_rank', 'target_value', 'gap']
+)
+PairComparison = namedtuple(
+    'PairComparison',
+    ['player_a', 'player_b', 'format_name', 'metric', 'value_a', 'value_b', 'gap']
+)
+
+
+def check_metrics(metrics):
+    """Reject metrics that have no source column (they are interpolated into SQL)"""
+    unknown = [metric for metric in metrics if metric not in METRIC_SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown metric(s) {unknown}; choose from {sorted(METRIC_SOURCES)}")
+    if not metrics:
+        raise ValueError("At least one metric is required")
+
+
+def _values_cte(name, columns, rows):
+    """Build a `name(columns) AS (VALUES ...)` CTE and its parameters"""
+    placeholders = ", ".join("(" + ", ".join(["%s"] * len(columns)) + ")" for _ in rows)
+    params = [value for row in rows for value in row]
+    return f"{name}({', '.join(columns)}) AS (VALUES {placeholders})", params
+
+
+def _metric_values_cte(metrics):
+    """UNION ALL of (metric, player_id, format_id, value) for the requested metrics"""
+    branches = []
+    for metric in metrics:
+        table, column = METRIC_SOURCES[metric]
+        branches.append(
+            f"SELECT '{metric}' AS metric, player_id, format_id, {column} AS value "
+            f"FROM {table} WHERE {column} IS NOT NULL"
+        )
+    return "metric_values AS (\n        " + "\n        UNION ALL\n        ".join(branches) + "\n    )"
+
+
+def _format_filter(alias, formats, params):
+    """Optional `AND f.format_name IN (...)` clause"""
+    if not formats:
+        return ""
+    params.extend(formats)
+    return f" AND {alias}.format_name IN ({', '.join(['%s'] * len(formats))})"
+
+
+def build_rank_gaps_query(players, metrics, target_ranks, formats=None):
+    """SQL and parameters for the current rank and gap to each target rank, for every player/metric/format
+
+    Players are found by their canonical name key or any recorded alias.
+    """
+    check_metrics(metrics)
+    if not players or not target_ranks:
+        raise ValueError("At least one player and one target rank are required")
+
+    requested_cte, params = _values_cte("requested", ["name_key"], [(normalize_name(name),) for name in players])
+    targets_cte, target_params = _values_cte("targets", ["target_rank"], [(int(rank),) for rank in target_ranks])
+    params += target_params
+
+    sql = f"""
+    WITH {requested_cte},
+    {PLAYER_KEYS_CTE},
+    {targets_cte},
+    {_metric_values_cte(metrics)},
+    ranked AS (
+        SELECT metric, player_id, format_id, value,
+               RANK() OVER (PARTITION BY metric, format_id ORDER BY value DESC) AS current_rank,
+               ROW_NUMBER() OVER (PARTITION BY metric, format_id ORDER BY value DESC) AS position
+        FROM metric_values
+    )
+    SELECT p.full_name, f.format_name, r.metric, r.value, r.current_rank,
+           t.target_rank, target.value AS target_value, target.value - r.value AS gap
+    FROM ranked r
+    JOIN players p ON p.player_id = r.player_id
+    JOIN formats f ON f.format_id = r.format_id
+    CROSS JOIN targets t
+    LEFT JOIN ranked target
+        ON target.metric = r.metric AND target.format_id = r.format_id AND target.position = t.target_rank
+    WHERE p.player_id IN (
+        SELECT k.player_id FROM player_keys k JOIN requested q ON k.name_key = q.name_key
+    ){_format_filter('f', formats, params)}
+    ORDER BY p.full_name COLLATE "C", f.format_name COLLATE "C", r.metric COLLATE "C", t.target_rank
+    """
+    return sql, params
+
+
+def build_pair_comparison_query(pairs, metrics, formats=None):
+    """SQL and parameters comparing player A with player B on each metric/format they share"""
+    check_metrics(metrics)
+    if not pairs:
+        raise ValueError("At least one pair of players is required")
+
+    pairs_cte, params = _values_cte(
+        "pairs", ["key_a", "key_b"], [(normalize_name(a), normalize_name(b)) for a, b in pairs]
+    )
+
+    sql = f"""
+    WITH {pairs_cte},
+    {PLAYER_KEYS_CTE},
+    {_metric_values_cte(metrics)}
+    SELECT pa.full_name, pb.full_name, f.format_name, a.metric, a.value, b.value, b.value - a.value AS gap
+    FROM pairs q
+    JOIN player_keys ka ON ka.name_key = q.key_a
+    JOIN player_keys kb ON kb.name_key = q.key_b
+    JOIN players pa ON pa.player_id = ka.player_id
+    JOIN players pb ON pb.player_id = kb.player_id
+    JOIN metric_values a ON a.player_id = pa.player_id
+    JOIN metric_values b ON b.player_id = pb.player_id AND b.metric = a.metric AND b.format_id = a.format_id
+    JOIN formats f ON f.format_id = a.format_id
+    WHERE 1 = 1{_format_filter('f', formats, params)}
+    ORDER BY pa.full_name COLLATE "C", pb.full_name COLLATE "C", f.format_name COLLATE "C", a.metric COLLATE "C"
+    """
+    return sql, params
+
+
+def fetch_rank_gaps(cursor, players, metrics=('matches',), target_ranks=(5,), formats=None):
+    """Current rank and gap to each target rank in a single query
+
+    `gap` is the target rank's value minus the player's value; zero or less means
+    the player is already at or above that rank.
+    """
+    sql, params = build_rank_gaps_query(list(dict.fromkeys(map(normalize_name, players))), list(metrics), list(target_ranks), formats)
+    cursor.execute(sql, params)
+    return [RankGap(*row) for row in cursor.fetchall()]
+
+
+def fetch_pair_comparisons(cursor, pairs, metrics=('matches',), formats=None):
+    """A vs B comparisons for any number of pairs in a single query
+
+    `gap` is how much player A needs to draw level with player B.
+    """
+    sql, params = build_pair_comparison_query(list(pairs), list(metrics), formats)
+    cursor.execute(sql, params)
+    return [PairComparison(*row) for row in cursor.fetchall()]
@@ -0,0 +1,201 @@
+import argparse
+import heapq
+from collections import namedtuple
+
+from dotenv import load_dotenv
+
+import db
+
+load_dotenv()
+
+# A composite score: sum of weight * value / scale over the columns of one stats table.
+# Negative weights mark lower-is-better columns. Scales are fixed reference values (not
+# min/max of the data), so a row's score never depends on other rows and a load only has
+# to rescore the rows it changed. The loader stores a missing economy or strike rate
+# (e.g. a bowler without wickets) as 0, so a lower-is-better column at 0 leaves the row
+# unranked rather than scoring it as the best possible value; columns in `requires` must
+# be positive for the row to be ranked at all.
+ScoringModel = namedtuple('ScoringModel', ['name', 'table', 'weights', 'min_matches', 'requires'],
+                          defaults=((),))
+
+DEFAULT_MODELS = [
+    ScoringModel('batting_impact', 'batting_stats', {
+        'runs': (0.5, 10000),
+        'average': (0.3, 50),
+        'strike_rate': (0.2, 100),
+    }, min_matches=10),
+    ScoringModel('bowling_impact', 'bowling_stats', {
+        'wickets': (0.5, 400),
+        'economy': (-0.25, 5),
+        'strike_rate': (-0.25, 50),
+    }, min_matches=10, requires=('wickets',)),
+]
+
+
+def score_row(model, values):
+    """Composite score of one row (dict of column values), or None if it doesn't qualify"""
+    if (values.get('matches') or 0) < model.min_matches:
+        return None
+    if any(not values.get(column) for column in model.requires):
+        return None
+    score = 0.0
+    for column, (weight, scale) in model.weights.items():
+        value = values.get(column)
+        if value is None or (weight < 0 and float(value) <= 0):
+            return None
+        score += weight * float(value) / scale
+    return round(score, 6)
+
+
+class Leaderboard:
+    """Top-K over changing scores: a max-heap with lazy deletion
+
+    Updates push a new heap entry and leave the old one in place; entries whose score no
+    longer matches `scores` are discarded when they surface. Reading the top k costs
+    O((k + stale entries) log n) instead of a full sort.
+    """
+
+    def __init__(self):
+        self.scores = {}
+        self._heap = []
+
+    def __len__(self):
+        return len(self.scores)
+
+    def update(self, player_id, score):
+        """Set (or with None, remove) a player's score"""
+        if score is None:
+            self.scores.pop(player_id, None)
+        elif self.scores.get(player_id) != score:
+            self.scores[player_id] = score
+            heapq.heappush(self._heap, (-score, player_id))
+        # Stale entries only cost time when they surface; rebuild once they dominate
+        if len(self._heap) > 2 * len(self.scores) + 64:
+            self._heap = [(-score, player_id) for player_id, score in self.scores.items()]
+            heapq.heapify(self._heap)
+
+    def top(self, k):
+        """[(player_id, score)] for the k highest scores, ties broken by player_id"""
+        taken = []
+        while self._heap and len(taken) < k:
+            negative, player_id = heapq.heappop(self._heap)
+            if self.scores.get(player_id) == -negative and (not taken or taken[-1][0] != player_id):
+                taken.append((player_id, -negative))
+        for player_id, score in taken:
+            heapq.heappush(self._heap, (-score, player_id))
+        return taken
+
+
+class RankingEngine:
+    """Composite-score leaderboards per scoring model and format, maintained incrementally
+
+    load() scores every row once; refresh(cursor, player_ids) rescores just the rows of the
+    given players (e.g. DataInserter.take_touched_players() after a load).
+    """
+
+    def __init__(self, models=DEFAULT_MODELS):
+        self.models = {model.name: model for model in models}
+        self.boards = {}
+        self.player_names = {}
+        self.format_names = {}
+
+    def load(self, cursor):
+        """Score every row from scratch"""
+        self.boards = {}
+        cursor.execute("SELECT format_id, format_name FROM formats")
+        self.format_names = dict(cursor.fetchall())
+        self._rescore(cursor, None)
+        return self
+
+    def refresh(self, cursor, player_ids):
+        """Rescore only the given players' rows; returns the number of rows rescored"""
+        if not player_ids:
+            return 0
+        cursor.execute("SELECT format_id, format_name FROM formats")
+        self.format_names = dict(cursor.fetchall())
+        return self._rescore(cursor, sorted(player_ids))
+
+    def _rows(self, cursor, model, player_ids):
+        """(player_id, full_name, format_id, column values) for a model's table"""
+        columns = sorted(set(model.weights) | set(model.requires) | {'matches'})
+        select = f"""
+            SELECT s.player_id, p.full_name, s.format_id, {', '.join(f's.{c}' for c in columns)}
+            FROM {model.table} s
+            JOIN players p ON p.player_id = s.player_id
+        """
+        chunks = [None] if player_ids is None else [
+            player_ids[start:start + db.ID_CHUNK] for start in range(0, len(player_ids), db.ID_CHUNK)
+        ]
+        for chunk in chunks:
+            if chunk is None:
+                cursor.execute(select)
+            else:
+                cursor.execute(f"{select} WHERE s.player_id IN ({', '.join(['%s'] * len(chunk))})", chunk)
+            for player_id, full_name, format_id, *values in cursor.fetchall():
+                yield player_id, full_name, format_id, dict(zip(columns, values))
+
+    def _rescore(self, cursor, player_ids):
+        rescored = 0
+        for model in self.models.values():
+            seen = set()
+            for player_id, full_name, format_id, values in self._rows(cursor, model, player_ids):
+                self.player_names[player_id] = full_name
+                board = self.boards.setdefault((model.name, format_id), Leaderboard())
+                board.update(player_id, score_row(model, values))
+                seen.add((player_id, format_id))
+                rescored += 1
+            if player_ids is not None:
+                # Rows that disappeared (player merged away, format dropped) leave the boards
+                for (name, format_id), board in self.boards.items():
+                    if name != model.name:
+                        continue
+                    for player_id in player_ids:
+                        if (player_id, format_id) not in seen:
+                            board.update(player_id, None)
+        return rescored
+
+    def top(self, model_name, format_name, k=10):
+        """[(full_name, score)] for the k best players of a format under a model"""
+        if model_name not in self.models:
+            raise ValueError(f"Unknown scoring model '{model_name}' (choose from {', '.join(self.models)})")
+        format_ids = [fid for fid, name in self.format_names.items() if name == format_name]
+        board = self.boards.get((model_name, format_ids[0])) if format_ids else None
+        if board is None:
+            return []
+        return [(self.player_names.get(player_id), score) for player_id, score in board.top(k)]
+
+    def leaderboards(self, k=10):
+        """{model name: {format name: top k}} for every model and format with scores"""
+        result = {}
+        for (model_name, format_id), board in sorted(self.boards.items()):
+            if len(board):
+                format_name = self.format_names.get(format_id, str(format_id))
+                result.setdefault(model_name, {})[format_name] = self.top(model_name, format_name, k)
+        return result
+
+
+def print_leaderboards(engine, k=5):
+    for model_name, by_format in engine.leaderboards(k).items():
+        print(f"\n📐 {model_name.replace('_', ' ').upper()}")
+        for format_name, leaders in sorted(by_format.items()):
+            print(f"  {format_name}:")
+            for i, (name, score) in enumerate(leaders, 1):
+                print(f"    {i}. {name} - {score:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Composite-score leaderboards per format")
+    parser.add_argument('--k', type=int, default=5)
+    args = parser.parse_args()
+
+    conn = db.connect()
+    cursor = conn.cursor()
+    try:
+        print_leaderboards(RankingEngine().load(cursor), args.k)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import numpy as np
+
+# Value stored when a converter returns None, by column kind
+_MISSING = {'int': 0, 'float': np.nan, 'text': ''}
+_DTYPES = {'int': np.int32, 'float': np.float64, 'text': object}
+
+
+class RowBuffer:
+    """Growable columnar store for scraped rows: one preallocated NumPy array per column
+
+    Raw cells are converted as rows are appended, so a page never exists as lists of
+    strings. Numbers cost 4-8 bytes each instead of a str object, and columns are handed
+    to pandas or the loader straight from the arrays.
+    """
+
+    def __init__(self, schema, capacity=256, drop_empty=False, float_fill=np.nan):
+        """schema: (column, kind, converter) triples, kind one of 'int', 'float', 'text'"""
+        self.columns = [column for column, _, _ in schema]
+        self._schema = schema
+        self._drop_empty = drop_empty
+        self._float_fill = float_fill
+        self._arrays = {column: np.empty(capacity, dtype=_DTYPES[kind]) for column, kind, _ in schema}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self):
+        for column, array in self._arrays.items():
+            grown = np.empty(max(2 * len(array), 16), dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._arrays[column] = grown
+
+    def append(self, raw):
+        """Convert and store one raw row; returns False if it was dropped as empty"""
+        if len(raw) != len(self._schema):
+            raise ValueError(f"{len(self._schema)} columns expected, row had {len(raw)}: {raw!r}")
+        values = [convert(cell) for (_, _, convert), cell in zip(self._schema, raw)]
+        if self._drop_empty and all(
+            value is None for (_, kind, _), value in zip(self._schema, values) if kind != 'text'
+        ):
+            return False
+        if self._size == len(self._arrays[self.columns[0]]):
+            self._grow()
+        for (column, kind, _), value in zip(self._schema, values):
+            if value is None:
+                value = self._float_fill if kind == 'float' else _MISSING[kind]
+            self._arrays[column][self._size] = value
+        self._size += 1
+        return True
+
+    def extend(self, raw_rows):
+        for raw in raw_rows:
+            self.append(raw)
+        return self
+
+    def column(self, name):
+        """Filled part of a column (a view, not a copy)"""
+        return self._arrays[name][:self._size]
+
+    def to_frame(self):
+        """DataFrame backed by the column arrays"""
+        import pandas as pd
+
+        return pd.DataFrame({column: self.column(column) for column in self.columns}, copy=False)
+
+    def records(self, start=0, stop=None):
+        """Rows as dicts keyed by column, with plain Python values, for the loader"""
+        stop = self._size if stop is None else min(stop, self._size)
+        values = [self._arrays[column][start:stop].tolist() for column in self.columns]
+        return [dict(zip(self.columns, row)) for row in zip(*values)]
+
+    def batches(self, batch_size):
+        """records() in slices of batch_size"""
+        for start in range(0, self._size, batch_size):
+            yield self.records(start, start + batch_size)
@@ -0,0 +1,285 @@
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+from dotenv import load_dotenv
+
+import db
+import query
+from player_profiles import get_profile_by_name
+from rank_gaps import fetch_rank_gaps
+
+load_dotenv()
+
+SERVICE_HOST = os.getenv('STATS_SERVICE_HOST', '127.0.0.1')
+SERVICE_PORT = int(os.getenv('STATS_SERVICE_PORT', '8080'))
+# Worker threads, each holding one warm connection (at most the pool size)
+SERVICE_WORKERS = int(os.getenv('STATS_SERVICE_WORKERS', str(db.POOL_MAX_CONNECTIONS)))
+# How long a read of the dataset version is trusted before asking the database again
+VERSION_TTL_SECONDS = float(os.getenv('STATS_SERVICE_VERSION_TTL', '1'))
+
+LEADERBOARD_TABLES = {'batting': 'batting_stats', 'bowling': 'bowling_stats'}
+
+
+class QueryPool:
+    """Awaitable access to the blocking query layer
+
+    Calls run on a fixed set of worker threads. Each thread keeps one connection from
+    db.connect() (the keep-alive pool on PostgreSQL) for its lifetime and ends the read
+    transaction after every call, so requests never pay connection set-up.
+    """
+
+    def __init__(self, workers=SERVICE_WORKERS, backend=None, database_url=None):
+        self.backend = backend
+        self.database_url = database_url
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='stats-db')
+        self._connection_errors = db.connection_errors(backend)
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = db.connect(self.backend, self.database_url)
+            self._local.conn = conn
+        return conn
+
+    def _discard_connection(self):
+        conn, self._local.conn = self._local.conn, None
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _call(self, func, args):
+        for attempt in range(2):
+            conn = self._connection()
+            cursor = conn.cursor()
+            try:
+                result = func(cursor, *args)
+                conn.rollback()
+                return result
+            except self._connection_errors:
+                # A dropped connection gets one retry on a fresh one
+                self._discard_connection()
+                if attempt:
+                    raise
+            except Exception:
+                # Bad input or a failing query: end the transaction, keep the connection
+                try:
+                    conn.rollback()
+                except Exception:
+                    self._discard_connection()
+                raise
+            finally:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+    async def run(self, func, *args):
+        """await func(cursor, *args) on a worker thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, func, args)
+
+    def _close_thread_connection(self, barrier):
+        # Each task waits until all have started, so every worker thread runs exactly one
+        barrier.wait()
+        if getattr(self._local, 'conn', None) is not None:
+            self._discard_connection()
+
+    def close(self):
+        """Close every worker's connection on its own thread (SQLite requires it), then stop"""
+        barrier = threading.Barrier(self.workers)
+        for future in [self._executor.submit(self._close_thread_connection, barrier) for _ in range(self.workers)]:
+            future.result()
+        self._executor.shutdown(wait=True)
+
+
+class Coalescer:
+    """Identical requests in flight share one query instead of each running their own"""
+
+    def __init__(self):
+        self._inflight = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def run(self, key, factory):
+        task = self._inflight.get(key)
+        if task is None:
+            self.started += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # A client going away must not cancel the query for everyone else waiting on it
+        return await asyncio.shield(task)
+
+
+class StatsService:
+    """Query-layer questions as JSON endpoints with coalescing and data-version ETags"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.coalescer = Coalescer()
+        self._version = None
+        self._version_read_at = 0.0
+
+    async def version(self):
+        """Dataset version, re-read from the database at most every VERSION_TTL_SECONDS"""
+        if self._version is None or time.monotonic() - self._version_read_at > VERSION_TTL_SECONDS:
+            self._version = await self.coalescer.run(('version',), lambda: self.pool.run(db.data_version))
+            self._version_read_at = time.monotonic()
+        return self._version
+
+    async def respond(self, request, func, *args, shape=lambda rows: rows):
+        """Run func(cursor, *args) (once for all identical in-flight requests) as a JSON response
+
+        The ETag is the dataset version, so a client holding a current response gets a 304
+        without a query being run.
+        """
+        version = await self.version()
+        etag = f'W/"{version}"'
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if etag in request.headers.get('If-None-Match', ''):
+            return web.Response(status=304, headers=headers)
+
+        key = (func.__name__, repr(args), version)
+        try:
+            result = await self.coalescer.run(key, lambda: self.pool.run(func, *args))
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=json.dumps({'error': str(e)}), content_type='application/json')
+        body = shape(result)
+        if body is None:
+            raise web.HTTPNotFound(text=json.dumps({'error': 'not found'}), content_type='application/json')
+        return web.json_response(body, headers=headers, dumps=_dumps)
+
+
+def _json_default(value):
+    """db.plain_value, falling back to str() for anything else JSON can't encode"""
+    plain = db.plain_value(value)
+    return str(value) if plain is value else plain
+
+
+def _dumps(body):
+    return json.dumps(body, default=_json_default)
+
+
+def _int_param(request, name, default):
+    try:
+        return int(request.query.get(name, default))
+    except ValueError:
+        raise web.HTTPBadRequest(text=json.dumps({'error': f"'{name}' must be an integer"}),
+                                 content_type='application/json')
+
+
+def _required(request, name):
+    value = request.query.get(name, '').strip()
+    if not value:
+        raise web.HTTPBadRequest(text=json.dumps({'error': f"'{name}' is required"}),
+                                 content_type='application/json')
+    return value
+
+
+async def search_players(request):
+    """GET /players?prefix=V"""
+    prefix = _required(request, 'prefix')
+    return await request.app['service'].respond(
+        request, query.search_players_by_prefix, prefix,
+        shape=lambda rows: {'players': [row[0] for row in rows]},
+    )
+
+
+async def player_batting(request):
+    """GET /players/batting?first=Virat&last=Kohli"""
+    first, last = _required(request, 'first'), _required(request, 'last')
+    return await request.app['service'].respond(
+        request, query.search_player_batting, first, last,
+        shape=lambda rows: {'records': [
+            {'player': name, 'format': format_name, 'runs': runs, 'matches': matches}
+            for name, format_name, runs, matches in rows
+        ]},
+    )
+
+
+async def player_profile(request):
+    """GET /players/{name}/profile"""
+    return await request.app['service'].respond(request, get_profile_by_name, request.match_info['name'])
+
+
+async def leaderboard(request):
+    """GET /leaderboards/{batting|bowling}/{metric}?k=5"""
+    table = LEADERBOARD_TABLES.get(request.match_info['table'])
+    if table is None:
+        raise web.HTTPNotFound(text=json.dumps({'error': 'unknown table'}), content_type='application/json')
+    k = _int_param(request, 'k', 5)
+    return await request.app['service'].respond(
+        request, query.top_k_per_format, request.match_info['metric'], k, table,
+        shape=lambda rows: {'leaders': [
+            {'format': format_name, 'player': player, 'value': value} for format_name, player, value in rows
+        ]},
+    )
+
+
+async def rank_gaps(request):
+    """GET /rank-gaps?player=...&metric=matches&rank=5[&format=ODI] (player, metric, rank, format repeatable)"""
+    players = tuple(request.query.getall('player', []))
+    if not players:
+        _required(request, 'player')
+    metrics = tuple(request.query.getall('metric', ['matches']))
+    formats = tuple(request.query.getall('format', [])) or None
+    try:
+        ranks = tuple(int(rank) for rank in request.query.getall('rank', ['5']))
+    except ValueError:
+        raise web.HTTPBadRequest(text=json.dumps({'error': "'rank' must be an integer"}),
+                                 content_type='application/json')
+    return await request.app['service'].respond(
+        request, fetch_rank_gaps, players, metrics, ranks, formats,
+        shape=lambda rows: {'gaps': [row._asdict() for row in rows]},
+    )
+
+
+async def health(request):
+    """GET /health: data version and coalescing counters"""
+    service = request.app['service']
+    return web.json_response({
+        'version': await service.version(),
+        'queries_started': service.coalescer.started,
+        'requests_coalesced': service.coalescer.coalesced,
+    })
+
+
+def create_app(pool=None):
+    """The aiohttp application; the pool is closed when the app shuts down"""
+    app = web.Application()
+    app['service'] = StatsService(pool or QueryPool())
+    app.router.add_get('/health', health)
+    app.router.add_get('/players', search_players)
+    app.router.add_get('/players/batting', player_batting)
+    app.router.add_get('/players/{name}/profile', player_profile)
+    app.router.add_get('/leaderboards/{table}/{metric}', leaderboard)
+    app.router.add_get('/rank-gaps', rank_gaps)
+
+    async def close_pool(app):
+        await asyncio.get_running_loop().run_in_executor(None, app['service'].pool.close)
+
+    app.on_cleanup.append(close_pool)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the stats questions as JSON over HTTP")
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    args = parser.parse_args()
+    web.run_app(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,7 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import numpy as np
 import os
 
-# Create csv_files folder if it doesn't exist
-if not os.path.exists('csv_files'):
-    os.makedirs('csv_files')
+from http_scheduler import default_scheduler
+from row_buffer import RowBuffer
 
 urls = {
     "test": "https://www.bcci.tv/international/men/stats/test",
@@ -20,8 +15,8 @@ column_names = [
 
 def clean_int(val):
     # Remove non-digit characters and convert to int, else return None
-    val = val.replace(',', '').split()[0]
-    return int(val) if val.isdigit() else None
+    parts = val.replace(',', '').split()
+    return int(parts[0]) if parts and parts[0].isdigit() else None
 
 def clean_float(val):
     try:
@@ -29,9 +24,22 @@ def clean_float(val):
     except:
         return None
 
-for name, url in urls.items():
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, "lxml")
+def batting_buffer():
+    """Empty typed batting row buffer (missing numbers become 0)"""
+    schema = [("Rank", 'int', clean_int), ("Player", 'text', str.strip)]
+    for col in column_names[2:]:
+        if col in ("Average", "Strike Rate"):
+            schema.append((col, 'float', clean_float))
+        else:
+            schema.append((col, 'int', clean_int))
+    return RowBuffer(schema, float_fill=0.0)
+
+def parse_batting_page(html, into=None):
+    """Extract batting rows from a stats page into `into` (a list of raw string rows by default,
+    or a RowBuffer to convert while parsing), or None if there is no table"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
     main_player_div = soup.find("div", class_="team-ranking-wrapper player")
     main_row = []
     if main_player_div:
@@ -49,11 +57,10 @@ for name, url in urls.items():
 
     table_div = soup.find("div", class_="stats-data-table-player")
     if not table_div:
-        print(f"No data table found for {name}")
-        continue
+        return None
     table = table_div.find("table")
     rows = table.find_all("tr")
-    data = []
+    data = [] if into is None else into
     if main_row:
         data.append(main_row)
     for row in rows:
@@ -66,20 +73,53 @@ for name, url in urls.items():
 
         if row_data:
             data.append(row_data)
-    # Convert data types
-    df = pd.DataFrame(data, columns=column_names)
-    # Convert columns to appropriate types
-    for col in ["Rank", "Matches", "Innings","Highest Score","4s", "6s", "50s", "100s", "Runs"]:
-        df[col] = df[col].apply(lambda x: clean_int(str(x)) if pd.notnull(x) else None)
-    for col in ["Average", "Strike Rate"]:
-        df[col] = df[col].apply(lambda x: clean_float(str(x)) if pd.notnull(x) else None)
-    
-    # Replace NaN values with 0 for all numeric columns
-    numeric_columns = ["Rank", "Matches", "Innings", "Average", "Strike Rate", 
-                      "Highest Score", "4s", "6s", "50s", "100s", "Runs"]
-    df[numeric_columns] = df[numeric_columns].fillna(0)
-    
-    # Save to csv_files folder
-    filename = f"csv_files/batting_most_runs_{name}.csv"
-    df.to_csv(filename, index=False)
-    print(f"Saved {filename}")
\ No newline at end of file
+    return data
+
+def clean_batting_rows(data):
+    """Build the typed batting DataFrame from raw rows"""
+    return batting_buffer().extend(data).to_frame()
+
+def scrape_batting_rows(name, url):
+    """Fetch one format's most-runs table into a typed RowBuffer, or None if no table was found
+
+    Fetch failures (after retries) raise instead of looking like an empty page.
+    """
+    response = default_scheduler().get(url)
+    rows = parse_batting_page(response.content, batting_buffer())
+    if rows is None:
+        print(f"No data table found for {name}")
+    return rows
+
+def scrape_batting_stats(name, url):
+    """Fetch and clean one format's most-runs table, or None if no table was found"""
+    rows = scrape_batting_rows(name, url)
+    return None if rows is None else rows.to_frame()
+
+def iter_batting_batches(name, url, batch_size=100):
+    """Yield typed batting rows (dicts keyed by CSV column) in batches of batch_size"""
+    rows = scrape_batting_rows(name, url)
+    if rows is None:
+        return
+    yield from rows.batches(batch_size)
+
+def main():
+    # Create csv_files folder if it doesn't exist
+    if not os.path.exists('csv_files'):
+        os.makedirs('csv_files')
+
+    for name, url in urls.items():
+        try:
+            df = scrape_batting_stats(name, url)
+        except Exception as e:
+            print(f"❌ Failed to fetch {name} batting stats: {e}")
+            continue
+        if df is None:
+            continue
+
+        # Save to csv_files folder
+        filename = f"csv_files/batting_most_runs_{name}.csv"
+        df.to_csv(filename, index=False)
+        print(f"Saved {filename}")
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,114 @@
-import time
-import pandas as pd
+import math
 import os
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-
-# Create csv_files folder if it doesn't exist
-if not os.path.exists('csv_files'):
-    os.makedirs('csv_files')
 
-def scrape_bowling_stats(format_name, url):
+from http_scheduler import REQUEST_TIMEOUT, default_scheduler
+from row_buffer import RowBuffer
+
+# Selector for the rows of the stats table the tabs switch between
+TABLE_ROWS = "div.stats-data-table-player table tbody tr"
+
+# Define column names
+column_names = [
+    "Rank", 
+    "Player", 
+    "Matches", 
+    "Innings", 
+    "Wickets", 
+    "Average", 
+    "Bowling_Figure", 
+    "Economy", 
+    "Strike_Rate", 
+    "Runs"
+]
+
+def _to_number(value):
+    """Number from a cell like '1,234' or '12.5', or None"""
+    try:
+        return float(str(value).replace(',', '').strip())
+    except ValueError:
+        return None
+
+def _to_int(value):
+    number = _to_number(value)
+    return None if number is None or math.isnan(number) else int(number)
+
+def _to_float(value):
+    try:
+        return float(str(value).strip())
+    except ValueError:
+        return None
+
+def convert_fraction_to_decimal(value):
+    """Bowling figure like '8/87' as wickets per run conceded (3 d.p.)"""
+    value_str = str(value).strip()
+    if '/' in value_str:
+        parts = value_str.split('/')
+        if len(parts) == 2:
+            numerator, denominator = _to_float(parts[0]), _to_float(parts[1])
+            if numerator is not None and denominator is not None:
+                return round(numerator / denominator, 3) if denominator != 0 else numerator
+    return _to_float(value_str)
+
+def bowling_buffer():
+    """Empty typed bowling row buffer; rows with no numbers at all are dropped"""
+    converters = {
+        "Player": ('text', lambda value: str(value).strip()),
+        "Bowling_Figure": ('float', convert_fraction_to_decimal),
+    }
+    for col in ["Rank", "Matches", "Innings", "Wickets", "Runs"]:
+        converters[col] = ('int', _to_int)
+    for col in ["Average", "Economy", "Strike_Rate"]:
+        converters[col] = ('float', _to_float)
+    return RowBuffer([(col, *converters[col]) for col in column_names], drop_empty=True)
+
+def clean_bowling_rows(data):
+    """Build the typed bowling DataFrame from raw rows"""
+    return bowling_buffer().extend(data).to_frame()
+
+def scrape_bowling_rows(format_name, url):
+    """Scrape one format's most-wickets table into a typed RowBuffer, or None if nothing was scraped"""
+    # Browser automation is only loaded when a scrape actually runs
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from webdriver_manager.chrome import ChromeDriverManager
+
     # Setup Chrome
     chrome_options = Options()
     chrome_options.add_argument("--start-maximized")
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+    driver.set_page_load_timeout(sum(REQUEST_TIMEOUT))
     wait = WebDriverWait(driver, 20)
 
-    driver.get(url)
+    # Page loads share the per-host rate limit with every other scraper fetch
+    with default_scheduler().slot(url):
+        driver.get(url)
 
-    # Click "Bowling Records" tab
+    # Click "Bowling Records" tab (the wait for the menu link below covers the tab switch)
     bowling_tab = wait.until(EC.element_to_be_clickable((By.ID, "bowling-records")))
     driver.execute_script("arguments[0].click();", bowling_tab)
-    time.sleep(2)
 
     # Click "Most wickets" inside Bowling menu
     most_wickets_tab = wait.until(
         EC.element_to_be_clickable((By.CSS_SELECTOR, "ul#bba-bowling li a[data-slug='bowling_top_wicket_takers']"))
     )
+    previous_rows = driver.find_elements(By.CSS_SELECTOR, TABLE_ROWS)
     driver.execute_script("arguments[0].click();", most_wickets_tab)
-    time.sleep(3)
 
-    # Scrape the top player's stats (main highlighted player)
-    data = []
+    # Wait for the old table to be replaced (if the page re-renders it) and the new rows to appear
+    if previous_rows:
+        try:
+            WebDriverWait(driver, 5).until(EC.staleness_of(previous_rows[0]))
+        except TimeoutException:
+            pass
+    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, TABLE_ROWS)))
+
+    # Scrape the top player's stats (main highlighted player); cells are typed as rows are added
+    data = bowling_buffer()
     
     try:
         main_player_div = driver.find_element(By.CSS_SELECTOR, "div.team-ranking-wrapper.player")
@@ -97,74 +170,45 @@ def scrape_bowling_stats(format_name, url):
                         row_data.append(lines[0] if lines else col.text.strip())
             
             if row_data and len(row_data) >= 3:
-                data.append(row_data)
+                try:
+                    data.append(row_data)
+                except ValueError as e:
+                    print(f"⚠️ Skipping malformed row: {e}")
     except Exception as e:
         print(f"⚠️ Could not find table rows: {e}")
 
-    # Define column names
-    column_names = [
-        "Rank", 
-        "Player", 
-        "Matches", 
-        "Innings", 
-        "Wickets", 
-        "Average", 
-        "Bowling_Figure", 
-        "Economy", 
-        "Strike_Rate", 
-        "Runs"
-    ]
-
-    if data:
-        # Create DataFrame
-        df = pd.DataFrame(data, columns=column_names)
-        
-        # Convert fractions in Bowling_Figure to decimal
-        def convert_fraction_to_decimal(value):
-            if pd.isna(value):
-                return value
-            value_str = str(value).strip()
-            if '/' in value_str:
-                try:
-                    parts = value_str.split('/')
-                    if len(parts) == 2:
-                        numerator = float(parts[0])
-                        denominator = float(parts[1])
-                        return round(numerator / denominator, 3) if denominator != 0 else numerator
-                except:
-                    pass
-            try:
-                return float(value_str)
-            except:
-                return value
-        
-        # Replace Bowling_Figure column with decimal values
-        df['Bowling_Figure'] = df['Bowling_Figure'].apply(convert_fraction_to_decimal)
-        
-        # Clean data types
-        numeric_columns = ["Rank", "Matches", "Innings", "Wickets", "Runs"]
-        float_columns = ["Average", "Economy", "Strike_Rate", "Bowling_Figure"]
-        
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col].astype(str).str.replace(',', ''), errors='coerce')
-        
-        for col in float_columns:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # Remove rows where all numeric columns are empty
-        numeric_cols_to_check = [col for col in numeric_columns + float_columns if col in df.columns]
-        df = df.dropna(subset=numeric_cols_to_check, how='all')
-        
-        # Save to csv_files folder
-        filename = f"csv_files/bowling_most_wickets_{format_name.lower()}.csv"
-        df.to_csv(filename, index=False)
-        print(f"✅ Saved {len(df)} rows to {filename}")
-    else:
+    driver.quit()
+    if not len(data):
         print("⚠️ No data scraped!")
+        return None
+    return data
 
-    driver.quit()
+def scrape_bowling_frame(format_name, url):
+    """Scrape and clean one format's most-wickets table, or None if nothing was scraped"""
+    rows = scrape_bowling_rows(format_name, url)
+    return None if rows is None else rows.to_frame()
+
+def scrape_bowling_stats(format_name, url):
+    """Scrape one format and save it to csv_files/"""
+    df = scrape_bowling_frame(format_name, url)
+    if df is None:
+        return
+
+    # Create csv_files folder if it doesn't exist
+    if not os.path.exists('csv_files'):
+        os.makedirs('csv_files')
+
+    # Save to csv_files folder
+    filename = f"csv_files/bowling_most_wickets_{format_name.lower()}.csv"
+    df.to_csv(filename, index=False)
+    print(f"✅ Saved {len(df)} rows to {filename}")
+
+def iter_bowling_batches(format_name, url, batch_size=100):
+    """Yield typed bowling rows (dicts keyed by CSV column) in batches of batch_size"""
+    rows = scrape_bowling_rows(format_name, url)
+    if rows is None:
+        return
+    yield from rows.batches(batch_size)
 
 if __name__ == "__main__":
     formats = {
@@ -172,6 +216,6 @@ if __name__ == "__main__":
         "Test": "https://www.bcci.tv/international/men/stats/test",
     }
 
+    # Requests are spaced by the shared scheduler's rate limit, not fixed sleeps
     for fmt, url in formats.items():
-        scrape_bowling_stats(fmt, url)
-        time.sleep(2)
\ No newline at end of file
+        scrape_bowling_stats(fmt, url)
\ No newline at end of file